@@ -10,7 +10,7 @@ from app.utils.database import get_db
 from app.services.session_service import create_session
 from app.services.tutor_service import get_tutor_statistics
 from app.services.reschedule_prediction_service import get_or_create_prediction
-from app.tasks.session_processor import process_session
+from app.tasks.session_processor import enqueue_session
 from app.middleware.auth import get_api_key
 from datetime import datetime
 
@@ -59,9 +59,9 @@ async def create_session_endpoint(
                 logger.warning(f"Failed to generate prediction for session {session.id}: {str(e)}")
                 # Continue anyway - prediction can be generated later
         
-        # Queue Celery task for background processing
+        # Queue Celery chain for background processing (scoring -> email report)
         try:
-            process_session.delay(str(session.id))
+            enqueue_session(str(session.id))
             logger.info(f"Queued session processing task for session {session.id}")
         except Exception as e:
             logger.error(f"Failed to queue Celery task for session {session.id}: {str(e)}")
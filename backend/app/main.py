@@ -7,12 +7,18 @@ from typing import List
 
 from fastapi import FastAPI, Request, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.openapi.utils import get_openapi
 
 from app.api.routes import router
 from app.utils.logging_config import setup_logging
 
+try:
+    import orjson  # noqa: F401  (required by ORJSONResponse)
+    DEFAULT_RESPONSE_CLASS = ORJSONResponse
+except ImportError:
+    DEFAULT_RESPONSE_CLASS = JSONResponse
+
 # Setup logging
 setup_logging()
 logger = logging.getLogger(__name__)
@@ -20,7 +26,8 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="Tutor Quality Scoring API",
     description="API for tutor performance evaluation",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=DEFAULT_RESPONSE_CLASS
 )
 
 # CORS configuration
@@ -101,15 +101,16 @@ class TutorScore(BaseModel):
     def check_risk_flag(self) -> None:
         """
         Update is_high_risk flag based on reschedule rates and threshold.
-        """
-        rates = [
-            self.reschedule_rate_7d or 0,
-            self.reschedule_rate_30d or 0,
-            self.reschedule_rate_90d or 0
-        ]
         
-        threshold = float(self.risk_threshold)
-        self.is_high_risk = any(float(rate or 0) > threshold for rate in rates)
+        Rates set by update_rates are already floats; values loaded from the
+        Numeric columns are converted once, so the comparison is plain float.
+        """
+        highest_rate = max(
+            float(self.reschedule_rate_7d or 0),
+            float(self.reschedule_rate_30d or 0),
+            float(self.reschedule_rate_90d or 0)
+        )
+        self.is_high_risk = highest_rate > float(self.risk_threshold)
     
     def to_dict(self) -> Dict:
         """
@@ -3,7 +3,7 @@ Email report generation and sending service.
 """
 import os
 import logging
-from datetime import datetime, timedelta
+from typing import Dict, Optional, Sequence
 from sqlalchemy.orm import Session
 from dotenv import load_dotenv
 
@@ -29,14 +29,25 @@ def format_insights(tutor_id: str, db: Session) -> str:
         Formatted insights string
     """
     tutor_score = db.query(TutorScore).filter(TutorScore.tutor_id == tutor_id).first()
+    return _format_score_insights(tutor_score)
+
+
+def _format_score_insights(tutor_score: Optional[TutorScore]) -> str:
+    """
+    Generate insights text from an already loaded tutor score.
     
+    Args:
+        tutor_score: TutorScore record, or None if the tutor has no score
+        
+    Returns:
+        Formatted insights string
+    """
     if not tutor_score:
         return "No score data available for this tutor."
     
     insights = []
     
     # Count recent reschedules
-    seven_days_ago = datetime.utcnow() - timedelta(days=7)
     recent_reschedules = tutor_score.tutor_reschedules_7d or 0
     
     if recent_reschedules > 0:
@@ -86,8 +97,27 @@ def generate_session_report(session_id: str, db: Session) -> str:
     
     tutor_score = db.query(TutorScore).filter(TutorScore.tutor_id == session.tutor_id).first()
     
+    return _render_session_report(session, tutor, tutor_score)
+
+
+def _render_session_report(
+    session: SessionModel,
+    tutor: Tutor,
+    tutor_score: Optional[TutorScore]
+) -> str:
+    """
+    Render HTML email report content from already loaded rows.
+    
+    Args:
+        session: Session record
+        tutor: Tutor of the session
+        tutor_score: TutorScore of the tutor, or None
+        
+    Returns:
+        HTML email content string
+    """
     # Get insights
-    insights = format_insights(str(tutor.id), db)
+    insights = _format_score_insights(tutor_score)
     
     # Format reschedule rate
     reschedule_rate = "N/A"
@@ -207,3 +237,53 @@ def send_session_report(session_id: str, recipient_email: str, db: Session) -> b
         logger.error(f"Error sending session report email: {str(e)}")
         return False
 
+
+def send_session_reports(
+    session_ids: Sequence[str],
+    recipient_email: str,
+    db: Session
+) -> Dict[str, bool]:
+    """
+    Generate and send report emails for many sessions.
+    
+    Sessions, tutors and tutor scores are loaded with a single joined
+    query, and every email goes through one email service instance.
+    
+    Args:
+        session_ids: UUID strings of the sessions
+        recipient_email: Email address of recipient
+        db: Database session
+        
+    Returns:
+        Dict mapping session_id string to whether its email was sent.
+        Sessions that do not exist (or have no tutor) are absent.
+    """
+    rows = db.query(SessionModel, Tutor, TutorScore).join(
+        Tutor,
+        Tutor.id == SessionModel.tutor_id
+    ).outerjoin(
+        TutorScore,
+        TutorScore.tutor_id == SessionModel.tutor_id
+    ).filter(SessionModel.id.in_(list(session_ids))).all()
+    
+    if not rows:
+        return {}
+    
+    email_service = get_email_service()
+    results = {}
+    for session, tutor, tutor_score in rows:
+        session_id = str(session.id)
+        try:
+            success = email_service.send_email(
+                to=recipient_email,
+                subject=f"Session Report - {session_id}",
+                html_content=_render_session_report(session, tutor, tutor_score)
+            )
+        except Exception as e:
+            logger.error("Error sending session report email for session %s: %s", session_id, e)
+            success = False
+        results[session_id] = success
+    
+    sent = sum(results.values())
+    logger.info("Sent %d/%d session report emails", sent, len(results))
+    return results
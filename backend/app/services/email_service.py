@@ -87,6 +87,25 @@ class SendGridEmailService:
             return False
 
 
+class NullEmailService:
+    """Email service that sends nothing (local development and tests)."""
+    
+    def send_email(self, to: str, subject: str, html_content: str) -> bool:
+        """
+        Discard an email.
+        
+        Args:
+            to: Recipient email address
+            subject: Email subject
+            html_content: HTML email content
+            
+        Returns:
+            Always True
+        """
+        logger.debug(f"Null email service: dropping email to {to}")
+        return True
+
+
 def get_email_service() -> EmailService:
     """
     Factory function to get email service instance.
@@ -101,6 +120,8 @@ def get_email_service() -> EmailService:
     
     if email_service == "sendgrid":
         return SendGridEmailService()
+    elif email_service == "null":
+        return NullEmailService()
     else:
         raise ValueError(f"Unsupported email service: {email_service}")
 
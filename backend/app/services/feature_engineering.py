@@ -1,11 +1,117 @@
 """
 Feature engineering service for match prediction model.
 """
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Sequence
 from decimal import Decimal
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit when numba is not installed."""
+        def decorator(func):
+            return func
+        return decorator
+
 from app.models.student import Student
 from app.models.tutor import Tutor
 
+# Column order of the bulk mismatch matrix, with the weight and cap used to
+# normalize each column in calculate_compatibility_score
+MISMATCH_KEYS = ('pace_mismatch', 'style_mismatch', 'communication_mismatch', 'age_difference')
+_MISMATCH_WEIGHTS = (0.3, 0.3, 0.2, 0.2)
+_MISMATCH_SCALES = (4.0, 1.0, 4.0, 20.0)
+
+# Canonical order of the model features returned by extract_features
+# (extract_features_vec uses the same column order)
+FEATURE_ORDER = MISMATCH_KEYS + (
+    'student_age', 'student_pace', 'student_urgency', 'student_experience', 'student_satisfaction',
+    'tutor_age', 'tutor_experience', 'tutor_confidence', 'tutor_pace',
+    'tutor_reschedule_rate_30d', 'tutor_total_sessions_30d', 'tutor_is_high_risk',
+    'compatibility_score',
+)
+
+
+# Sentinel passed to _mismatch_core for a missing preference
+_MISSING = -1
+
+# Teaching styles are compared as small integer IDs inside the JIT kernel.
+# The table is fixed: any other style maps to _UNKNOWN_STYLE, which only
+# matches itself (and _UNKNOWN_STYLE_OTHER when two unknown styles differ)
+_STYLE_IDS = {'structured': 0, 'flexible': 1, 'interactive': 2}
+_UNKNOWN_STYLE = -2
+_UNKNOWN_STYLE_OTHER = -3
+
+
+def _style_id(style: Optional[str]) -> int:
+    """Map a teaching style to its integer ID (_MISSING if not set)."""
+    if not style:
+        return _MISSING
+    return _STYLE_IDS.get(style.lower(), _UNKNOWN_STYLE)
+
+
+def _style_id_pair(student_style: Optional[str], tutor_style: Optional[str]) -> tuple:
+    """
+    Map a student/tutor style pair to IDs for _mismatch_core.
+    
+    Two unknown styles share _UNKNOWN_STYLE, so the strings themselves
+    decide whether they match.
+    """
+    student_id = _style_id(student_style)
+    tutor_id = _style_id(tutor_style)
+    if (student_id == tutor_id == _UNKNOWN_STYLE
+            and student_style.lower() != tutor_style.lower()):
+        tutor_id = _UNKNOWN_STYLE_OTHER
+    return student_id, tutor_id
+
+
+def _or_missing(value: Optional[int]) -> int:
+    """Replace None with the _MISSING sentinel."""
+    return _MISSING if value is None else value
+
+
+@njit(cache=True, fastmath=True)
+def _mismatch_core(s_pace, t_pace, s_style_id, t_style_id, s_comm, t_comm, s_age, t_age):
+    """
+    Arithmetic core of calculate_mismatch_scores on scalar primitives.
+    
+    Missing values are passed as _MISSING and fall back to the same
+    defaults as before (2.5, 0.5, 2.5 and 10).
+    
+    Returns:
+        Tuple of (pace, style, communication, age) mismatches
+    """
+    if s_pace != _MISSING and t_pace != _MISSING:
+        pace = float(abs(s_pace - t_pace))
+    else:
+        pace = 2.5
+    
+    if s_style_id != _MISSING and t_style_id != _MISSING:
+        style = 0.0 if s_style_id == t_style_id else 1.0
+    else:
+        style = 0.5
+    
+    if s_comm != _MISSING and t_comm != _MISSING:
+        comm = float(abs(s_comm - t_comm))
+    else:
+        comm = 2.5
+    
+    if s_age != _MISSING and t_age != _MISSING:
+        age = float(abs(s_age - t_age))
+    else:
+        age = 10.0
+    
+    return pace, style, comm, age
+
 
 def calculate_mismatch_scores(student: Student, tutor: Tutor) -> Dict[str, float]:
     """
@@ -21,40 +127,22 @@ def calculate_mismatch_scores(student: Student, tutor: Tutor) -> Dict[str, float
         - style_mismatch: Binary mismatch in teaching style (0=match, 1=mismatch)
         - communication_mismatch: Absolute difference in communication style (0-4)
         - age_difference: Absolute difference in age (0+)
+        
+        All values are floats, including whole-number differences.
     """
-    mismatch_scores = {}
-    
-    # Pace mismatch (1-5 scale)
-    if student.preferred_pace is not None and tutor.preferred_pace is not None:
-        mismatch_scores['pace_mismatch'] = abs(student.preferred_pace - tutor.preferred_pace)
-    else:
-        mismatch_scores['pace_mismatch'] = 2.5  # Default to middle if missing
-    
-    # Style mismatch (binary: 0 if match, 1 if different)
-    if student.preferred_teaching_style and tutor.teaching_style:
-        if student.preferred_teaching_style.lower() == tutor.teaching_style.lower():
-            mismatch_scores['style_mismatch'] = 0.0
-        else:
-            mismatch_scores['style_mismatch'] = 1.0
-    else:
-        mismatch_scores['style_mismatch'] = 0.5  # Default to middle if missing
-    
-    # Communication mismatch (1-5 scale)
-    if (student.communication_style_preference is not None and 
-        tutor.communication_style is not None):
-        mismatch_scores['communication_mismatch'] = abs(
-            student.communication_style_preference - tutor.communication_style
-        )
-    else:
-        mismatch_scores['communication_mismatch'] = 2.5  # Default to middle if missing
-    
-    # Age difference
-    if student.age is not None and tutor.age is not None:
-        mismatch_scores['age_difference'] = abs(student.age - tutor.age)
-    else:
-        mismatch_scores['age_difference'] = 10  # Default if missing
-    
-    return mismatch_scores
+    student_style_id, tutor_style_id = _style_id_pair(
+        student.preferred_teaching_style, tutor.teaching_style
+    )
+    return dict(zip(MISMATCH_KEYS, _mismatch_core(
+        _or_missing(student.preferred_pace),
+        _or_missing(tutor.preferred_pace),
+        student_style_id,
+        tutor_style_id,
+        _or_missing(student.communication_style_preference),
+        _or_missing(tutor.communication_style),
+        _or_missing(student.age),
+        _or_missing(tutor.age),
+    )))
 
 
 def calculate_compatibility_score(mismatch_scores: Dict[str, float]) -> float:
@@ -69,27 +157,11 @@ def calculate_compatibility_score(mismatch_scores: Dict[str, float]) -> float:
     Returns:
         Compatibility score (0-1), where 1 is perfect match
     """
-    # Weights for each mismatch type
-    weights = {
-        'pace_mismatch': 0.3,
-        'style_mismatch': 0.3,
-        'communication_mismatch': 0.2,
-        'age_difference': 0.2,
-    }
-    
-    # Normalize each mismatch score to 0-1 scale
-    # Max values: pace=4, style=1, communication=4, age=unbounded (cap at 20)
-    normalized_mismatches = {
-        'pace_mismatch': min(mismatch_scores['pace_mismatch'] / 4.0, 1.0),
-        'style_mismatch': mismatch_scores['style_mismatch'],  # Already 0-1
-        'communication_mismatch': min(mismatch_scores['communication_mismatch'] / 4.0, 1.0),
-        'age_difference': min(mismatch_scores['age_difference'] / 20.0, 1.0),
-    }
-    
-    # Calculate weighted average mismatch
+    # Normalize each mismatch score to 0-1 scale against _MISMATCH_SCALES,
+    # then take the weighted average mismatch
     weighted_mismatch = sum(
-        weights[key] * normalized_mismatches[key]
-        for key in weights.keys()
+        weight * min(mismatch_scores[key] / scale, 1.0)
+        for key, weight, scale in zip(MISMATCH_KEYS, _MISMATCH_WEIGHTS, _MISMATCH_SCALES)
     )
     
     # Compatibility is inverse of mismatch
@@ -99,49 +171,269 @@ def calculate_compatibility_score(mismatch_scores: Dict[str, float]) -> float:
     return max(0.0, min(1.0, compatibility_score))
 
 
-def extract_features(student: Student, tutor: Tutor, tutor_stats: Optional[Dict] = None) -> Dict[str, float]:
+def calculate_mismatch_scores_bulk(student: Student, tutors: Sequence[Tutor]):
     """
-    Extract all features for ML model prediction.
+    Calculate mismatch scores between one student and many tutors at once.
+    
+    Vectorized equivalent of calling calculate_mismatch_scores per tutor,
+    with the same defaults for missing values.
     
     Args:
         student: Student model instance
-        tutor: Tutor model instance
-        tutor_stats: Optional tutor statistics (reschedule rates, etc.)
+        tutors: Tutor model instances
         
     Returns:
-        Dictionary of feature names and values for ML model
+        NumPy array of shape (len(tutors), 4), columns ordered as MISMATCH_KEYS
     """
-    # Calculate mismatch scores
-    mismatch_scores = calculate_mismatch_scores(student, tutor)
+    if np is None:
+        raise ImportError("numpy is required for bulk mismatch scoring")
     
-    # Base features from mismatch scores
-    features = mismatch_scores.copy()
+    def _abs_diff(student_value, tutor_values, default):
+        # Missing values on either side fall back to the default
+        if student_value is None:
+            return np.full(len(tutor_values), default)
+        arr = np.array(
+            [np.nan if v is None else v for v in tutor_values], dtype=np.float64
+        )
+        return np.where(np.isnan(arr), default, np.abs(arr - student_value))
+    
+    pace = _abs_diff(student.preferred_pace, [t.preferred_pace for t in tutors], 2.5)
+    communication = _abs_diff(
+        student.communication_style_preference,
+        [t.communication_style for t in tutors],
+        2.5
+    )
+    age = _abs_diff(student.age, [t.age for t in tutors], 10.0)
+    
+    if student.preferred_teaching_style:
+        student_style = student.preferred_teaching_style.lower()
+        styles = np.array([(t.teaching_style or '').lower() for t in tutors], dtype=object)
+        style = np.where(styles == '', 0.5, (styles != student_style).astype(np.float64))
+    else:
+        style = np.full(len(tutors), 0.5)
     
-    # Student features
-    features['student_age'] = float(student.age) if student.age else 15.0
-    features['student_pace'] = float(student.preferred_pace) if student.preferred_pace else 3.0
-    features['student_urgency'] = float(student.urgency_level) if student.urgency_level else 3.0
-    features['student_experience'] = float(student.previous_tutoring_experience) if student.previous_tutoring_experience else 0.0
-    features['student_satisfaction'] = float(student.previous_satisfaction) if student.previous_satisfaction else 3.0
+    return np.column_stack((pace, style, communication, age)).astype(np.float64)
+
+
+def calculate_compatibility_score_bulk(mismatch_matrix):
+    """
+    Calculate compatibility scores for a bulk mismatch matrix.
     
-    # Tutor features
-    features['tutor_age'] = float(tutor.age) if tutor.age else 30.0
-    features['tutor_experience'] = float(tutor.experience_years) if tutor.experience_years else 2.0
-    features['tutor_confidence'] = float(tutor.confidence_level) if tutor.confidence_level else 3.0
-    features['tutor_pace'] = float(tutor.preferred_pace) if tutor.preferred_pace else 3.0
+    Args:
+        mismatch_matrix: Array from calculate_mismatch_scores_bulk
+        
+    Returns:
+        NumPy array of compatibility scores (0-1), one per row
+    """
+    normalized = np.minimum(mismatch_matrix / np.asarray(_MISMATCH_SCALES), 1.0)
+    weighted_mismatch = normalized @ np.asarray(_MISMATCH_WEIGHTS)
+    return np.clip(1.0 - weighted_mismatch, 0.0, 1.0)
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _compatibility_columns_core(s_pace, t_pace, s_style_id, t_style_id, s_comm, t_comm, s_age, t_age):
+    """
+    Compatibility for column arrays of pairs, fused into one parallel loop.
     
+    Returns:
+        Array of compatibility scores (0-1), one per pair
+    """
+    n = s_pace.shape[0]
+    out = np.empty(n)
+    for i in prange(n):
+        mismatches = _mismatch_core(
+            s_pace[i], t_pace[i], s_style_id[i], t_style_id[i],
+            s_comm[i], t_comm[i], s_age[i], t_age[i]
+        )
+        weighted_mismatch = 0.0
+        for j in range(4):
+            weighted_mismatch += _MISMATCH_WEIGHTS[j] * min(mismatches[j] / _MISMATCH_SCALES[j], 1.0)
+        out[i] = min(max(1.0 - weighted_mismatch, 0.0), 1.0)
+    return out
+
+
+def calculate_compatibility_score_columns(
+    student_pace, tutor_pace, student_style_id, tutor_style_id,
+    student_communication, tutor_communication, student_age, tutor_age
+):
+    """
+    Calculate compatibility scores for many student/tutor pairs given as columns.
+    
+    For batch scoring (simulations, backfills) without model instances.
+    Each argument is an integer array with one entry per pair; missing
+    values are -1. Teaching styles are integer IDs where equal IDs match.
+    Uses a numba kernel when numba is installed, else the NumPy bulk path.
+    
+    Returns:
+        NumPy array of compatibility scores (0-1), one per pair
+    """
+    if np is None:
+        raise ImportError("numpy is required for bulk compatibility scoring")
+    
+    columns = [
+        np.ascontiguousarray(column, dtype=np.int64)
+        for column in (
+            student_pace, tutor_pace, student_style_id, tutor_style_id,
+            student_communication, tutor_communication, student_age, tutor_age
+        )
+    ]
+    if NUMBA_AVAILABLE:
+        return _compatibility_columns_core(*columns)
+    
+    s_pace, t_pace, s_style, t_style, s_comm, t_comm, s_age, t_age = columns
+    
+    def _abs_diff(student_values, tutor_values, default):
+        missing = (student_values == _MISSING) | (tutor_values == _MISSING)
+        return np.where(missing, default, np.abs(student_values - tutor_values))
+    
+    style_missing = (s_style == _MISSING) | (t_style == _MISSING)
+    mismatch_matrix = np.column_stack((
+        _abs_diff(s_pace, t_pace, 2.5),
+        np.where(style_missing, 0.5, (s_style != t_style).astype(np.float64)),
+        _abs_diff(s_comm, t_comm, 2.5),
+        _abs_diff(s_age, t_age, 10.0),
+    )).astype(np.float64)
+    return calculate_compatibility_score_bulk(mismatch_matrix)
+
+
+def mismatch_rows_to_dicts(mismatch_matrix) -> List[Dict[str, float]]:
+    """
+    Convert a bulk mismatch matrix into per-tutor mismatch dictionaries.
+    
+    Args:
+        mismatch_matrix: Array from calculate_mismatch_scores_bulk
+        
+    Returns:
+        List of dictionaries shaped like calculate_mismatch_scores output
+    """
+    return [dict(zip(MISMATCH_KEYS, row)) for row in mismatch_matrix.tolist()]
+
+
+def _student_feature_values(student: Student) -> List[float]:
+    """Student columns of FEATURE_ORDER, as plain floats."""
+    return [
+        float(student.age) if student.age else 15.0,
+        float(student.preferred_pace) if student.preferred_pace else 3.0,
+        float(student.urgency_level) if student.urgency_level else 3.0,
+        float(student.previous_tutoring_experience) if student.previous_tutoring_experience else 0.0,
+        float(student.previous_satisfaction) if student.previous_satisfaction else 3.0,
+    ]
+
+
+def _tutor_feature_values(tutor: Tutor, tutor_stats: Optional[Dict]) -> List[float]:
+    """Tutor and tutor statistics columns of FEATURE_ORDER, as plain floats."""
     # Tutor statistics (if available)
     if tutor_stats:
-        features['tutor_reschedule_rate_30d'] = float(tutor_stats.get('reschedule_rate_30d', 0.0))
-        features['tutor_total_sessions_30d'] = float(tutor_stats.get('total_sessions_30d', 0))
-        features['tutor_is_high_risk'] = float(1.0 if tutor_stats.get('is_high_risk', False) else 0.0)
+        reschedule_rate_30d = float(tutor_stats.get('reschedule_rate_30d', 0.0))
+        total_sessions_30d = float(tutor_stats.get('total_sessions_30d', 0))
+        is_high_risk = float(1.0 if tutor_stats.get('is_high_risk', False) else 0.0)
     else:
-        features['tutor_reschedule_rate_30d'] = 0.0
-        features['tutor_total_sessions_30d'] = 0.0
-        features['tutor_is_high_risk'] = 0.0
+        reschedule_rate_30d = total_sessions_30d = is_high_risk = 0.0
+    
+    return [
+        float(tutor.age) if tutor.age else 30.0,
+        float(tutor.experience_years) if tutor.experience_years else 2.0,
+        float(tutor.confidence_level) if tutor.confidence_level else 3.0,
+        float(tutor.preferred_pace) if tutor.preferred_pace else 3.0,
+        reschedule_rate_30d,
+        total_sessions_30d,
+        is_high_risk,
+    ]
+
+
+def _feature_values(student: Student, tutor: Tutor, tutor_stats: Optional[Dict]) -> List[float]:
+    """Compute model features as plain floats, in FEATURE_ORDER."""
+    # Calculate mismatch scores
+    mismatch_scores = calculate_mismatch_scores(student, tutor)
+    
+    return [
+        # Base features from mismatch scores
+        *(mismatch_scores[key] for key in MISMATCH_KEYS),
+        *_student_feature_values(student),
+        *_tutor_feature_values(tutor, tutor_stats),
+        # Calculate compatibility score
+        calculate_compatibility_score(mismatch_scores),
+    ]
+
+
+def extract_features(student: Student, tutor: Tutor, tutor_stats: Optional[Dict] = None) -> Dict[str, float]:
+    """
+    Extract all features for ML model prediction.
     
-    # Calculate compatibility score
-    features['compatibility_score'] = calculate_compatibility_score(mismatch_scores)
+    Args:
+        student: Student model instance
+        tutor: Tutor model instance
+        tutor_stats: Optional tutor statistics (reschedule rates, etc.)
+        
+    Returns:
+        Dictionary of feature names and values for ML model, in FEATURE_ORDER
+    """
+    return dict(zip(FEATURE_ORDER, _feature_values(student, tutor, tutor_stats)))
+
+
+def extract_features_vec(
+    student: Student,
+    tutor: Tutor,
+    tutor_stats: Optional[Dict] = None,
+    out: Optional["np.ndarray"] = None
+) -> "np.ndarray":
+    """
+    Extract all features as a float32 vector in FEATURE_ORDER.
+    
+    float32 matches the precision XGBoost scores with, and batch callers
+    can pass a row of a preallocated matrix as out to avoid a copy.
     
-    return features
+    Args:
+        student: Student model instance
+        tutor: Tutor model instance
+        tutor_stats: Optional tutor statistics (reschedule rates, etc.)
+        out: Optional float32 array of len(FEATURE_ORDER) to write into
+        
+    Returns:
+        The filled feature vector (out, if given)
+    """
+    if out is None:
+        out = np.empty(len(FEATURE_ORDER), dtype=np.float32)
+    out[:] = _feature_values(student, tutor, tutor_stats)
+    return out
+
 
+def extract_features_bulk(
+    student: Student,
+    tutors: Sequence[Tutor],
+    tutor_stats_list: Sequence[Optional[Dict]],
+    mismatch_matrix,
+    compatibility_scores,
+    out: Optional["np.ndarray"] = None
+) -> "np.ndarray":
+    """
+    Extract features for one student against many tutors as a float32 matrix.
+    
+    Reuses the mismatch and compatibility scores the caller already computed
+    in bulk; only the tutor columns are filled per row.
+    
+    Args:
+        student: Student model instance
+        tutors: Tutor model instances
+        tutor_stats_list: Tutor statistics, aligned with tutors
+        mismatch_matrix: Array from calculate_mismatch_scores_bulk
+        compatibility_scores: Array from calculate_compatibility_score_bulk
+        out: Optional float32 array of shape (len(tutors), len(FEATURE_ORDER))
+        
+    Returns:
+        The filled feature matrix (out, if given), columns in FEATURE_ORDER
+    """
+    if out is None:
+        out = np.empty((len(tutors), len(FEATURE_ORDER)), dtype=np.float32)
+    
+    student_values = _student_feature_values(student)
+    tutor_start = len(MISMATCH_KEYS) + len(student_values)
+    
+    out[:, :len(MISMATCH_KEYS)] = mismatch_matrix
+    out[:, len(MISMATCH_KEYS):tutor_start] = student_values
+    out[:, tutor_start:-1] = [
+        _tutor_feature_values(tutor, tutor_stats)
+        for tutor, tutor_stats in zip(tutors, tutor_stats_list)
+    ]
+    out[:, -1] = compatibility_scores
+    return out
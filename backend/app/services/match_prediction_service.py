@@ -2,10 +2,12 @@
 Match prediction service using trained ML model.
 """
 import os
+import bisect
 import json
 import logging
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Dict
+from typing import Optional, Dict, List, Sequence
 from decimal import Decimal
 from sqlalchemy.orm import Session
 
@@ -21,15 +23,41 @@ except ImportError:
 from app.models.student import Student
 from app.models.tutor import Tutor
 from app.models.match_prediction import MatchPrediction
-from app.services.feature_engineering import extract_features, calculate_mismatch_scores, calculate_compatibility_score
+from app.services.feature_engineering import (
+    FEATURE_ORDER,
+    extract_features_bulk,
+    extract_features_vec,
+    calculate_mismatch_scores,
+    calculate_compatibility_score,
+    calculate_mismatch_scores_bulk,
+    calculate_compatibility_score_bulk,
+    mismatch_rows_to_dicts,
+)
 
 logger = logging.getLogger(__name__)
 
+# Risk levels, indexed by how many threshold bounds a probability reaches
+_RISK_LABELS = ('low', 'medium', 'high')
+
 # Cached model and metadata
 _cached_model = None
 _cached_feature_names = None
 _cached_metadata = None
 
+# Memoized predict_match results, keyed by the values of every input the
+# prediction reads, so edited students/tutors simply miss the cache
+PREDICTION_CACHE_MAX_ENTRIES = 4096
+_STUDENT_FEATURE_FIELDS = (
+    'age', 'preferred_pace', 'preferred_teaching_style', 'communication_style_preference',
+    'urgency_level', 'previous_tutoring_experience', 'previous_satisfaction',
+)
+_TUTOR_FEATURE_FIELDS = (
+    'age', 'preferred_pace', 'teaching_style', 'communication_style',
+    'experience_years', 'confidence_level',
+)
+_TUTOR_STATS_FIELDS = ('reschedule_rate_30d', 'total_sessions_30d', 'is_high_risk')
+_prediction_cache: Dict[tuple, Dict] = {}
+
 
 def clear_model_cache():
     """
@@ -41,9 +69,30 @@ def clear_model_cache():
     _cached_model = None
     _cached_feature_names = None
     _cached_metadata = None
+    clear_prediction_cache()
     logger.info("Model cache cleared - next prediction will load new model")
 
 
+def clear_prediction_cache():
+    """Drop all memoized predict_match results."""
+    _prediction_cache.clear()
+
+
+def _feature_tuple(entity, fields: Sequence[str]) -> tuple:
+    """Return the values of the given attributes of a model instance."""
+    return tuple(getattr(entity, field, None) for field in fields)
+
+
+def _prediction_key(student: Student, tutor: Tutor, tutor_stats: Optional[Dict]) -> tuple:
+    """Build the predict_match memo key from the inputs it reads."""
+    stats = tuple(tutor_stats.get(field) for field in _TUTOR_STATS_FIELDS) if tutor_stats else None
+    return (
+        _feature_tuple(student, _STUDENT_FEATURE_FIELDS),
+        _feature_tuple(tutor, _TUTOR_FEATURE_FIELDS),
+        stats,
+    )
+
+
 def _get_model_path() -> Path:
     """Get path to model file."""
     backend_dir = Path(__file__).parent.parent.parent
@@ -87,8 +136,9 @@ def load_model():
             "Please run: python scripts/train_match_model.py"
         )
     
-    # Load model
+    # Load model (predictions memoized with the fallback are now stale)
     _cached_model = joblib.load(model_path)
+    clear_prediction_cache()
     logger.info(f"Loaded model from {model_path}")
     
     # Load feature names
@@ -112,6 +162,14 @@ def load_model():
     return _cached_model, _cached_feature_names, _cached_metadata
 
 
+def _risk_bounds(low_threshold: float, high_threshold: float) -> tuple:
+    """Return (low, high) bounds, letting the environment override the thresholds."""
+    return (
+        float(os.getenv('MATCH_RISK_THRESHOLD_LOW', low_threshold)),
+        float(os.getenv('MATCH_RISK_THRESHOLD_HIGH', high_threshold)),
+    )
+
+
 def determine_risk_level(probability: float, 
                          low_threshold: float = 0.3, 
                          high_threshold: float = 0.7) -> str:
@@ -126,16 +184,80 @@ def determine_risk_level(probability: float,
     Returns:
         Risk level: 'low', 'medium', or 'high'
     """
-    # Allow override from environment
-    low_threshold = float(os.getenv('MATCH_RISK_THRESHOLD_LOW', low_threshold))
-    high_threshold = float(os.getenv('MATCH_RISK_THRESHOLD_HIGH', high_threshold))
-    
-    if probability < low_threshold:
-        return 'low'
-    elif probability < high_threshold:
-        return 'medium'
+    bounds = _risk_bounds(low_threshold, high_threshold)
+    return _RISK_LABELS[bisect.bisect_right(bounds, probability)]
+
+
+def determine_risk_level_bulk(probabilities: Sequence[float],
+                              low_threshold: float = 0.3,
+                              high_threshold: float = 0.7) -> List[str]:
+    """
+    Determine risk levels for many churn probabilities at once.
+    
+    Args:
+        probabilities: Churn probabilities (0-1)
+        low_threshold: Threshold for low risk (see determine_risk_level)
+        high_threshold: Threshold for high risk (see determine_risk_level)
+        
+    Returns:
+        Risk levels, in the same order as probabilities
+    """
+    bounds = _risk_bounds(low_threshold, high_threshold)
+    if np is None:
+        return [_RISK_LABELS[bisect.bisect_right(bounds, p)] for p in probabilities]
+    indices = np.searchsorted(bounds, np.asarray(probabilities, dtype=float), side='right')
+    return np.take(_RISK_LABELS, indices).tolist()
+
+
+@lru_cache(maxsize=8)
+def _feature_columns(feature_names: tuple) -> "np.ndarray":
+    """
+    Map model feature names to columns of the _feature_matrix buffer.
+    
+    Names extract_features does not produce map to the trailing all-zero
+    column; no names means every feature in FEATURE_ORDER.
+    """
+    if not feature_names:
+        return np.arange(len(FEATURE_ORDER))
+    index = {name: i for i, name in enumerate(FEATURE_ORDER)}
+    return np.array([index.get(name, len(FEATURE_ORDER)) for name in feature_names])
+
+
+def _feature_matrix(
+    student: Student,
+    tutors: Sequence[Tutor],
+    tutor_stats_list: Sequence[Optional[Dict]],
+    feature_names: Optional[List[str]],
+    mismatch_matrix=None,
+    compatibility_scores=None
+) -> "np.ndarray":
+    """
+    Build the float32 model input for one student against many tutors.
+    
+    Args:
+        student: Student model instance
+        tutors: Tutor model instances
+        tutor_stats_list: Tutor statistics, aligned with tutors
+        feature_names: Feature columns the model was trained on
+        mismatch_matrix: Optional bulk mismatch scores already computed for
+            these tutors (with compatibility_scores); reused instead of
+            recomputing each pair
+        compatibility_scores: Optional bulk compatibility scores
+        
+    Returns:
+        Array of shape (len(tutors), len(feature_names))
+    """
+    # One row per tutor, filled in place, plus a zero column for unknown names
+    buffer = np.zeros((len(tutors), len(FEATURE_ORDER) + 1), dtype=np.float32)
+    if mismatch_matrix is not None:
+        extract_features_bulk(
+            student, tutors, tutor_stats_list,
+            mismatch_matrix, compatibility_scores, out=buffer[:, :-1]
+        )
     else:
-        return 'high'
+        for row, tutor, tutor_stats in zip(buffer, tutors, tutor_stats_list):
+            extract_features_vec(student, tutor, tutor_stats, out=row[:-1])
+    return buffer[:, _feature_columns(tuple(feature_names or ()))]
 
 
 def predict_churn_risk(student: Student, tutor: Tutor, tutor_stats: Optional[Dict] = None) -> float:
@@ -160,15 +282,8 @@ def predict_churn_risk(student: Student, tutor: Tutor, tutor_stats: Optional[Dic
         # Churn probability is inverse of compatibility
         return 1.0 - compatibility
     
-    # Extract features
-    features = extract_features(student, tutor, tutor_stats)
-    
-    # Ensure features are in correct order
-    if feature_names:
-        feature_vector = np.array([[features.get(name, 0.0) for name in feature_names]])
-    else:
-        # Fallback: use all features
-        feature_vector = np.array([[v for v in features.values()]])
+    # Extract features in the model's column order
+    feature_vector = _feature_matrix(student, [tutor], [tutor_stats], feature_names)
     
     # Predict
     probability = model.predict_proba(feature_vector)[0, 1]  # Probability of churn (class 1)
@@ -192,24 +307,100 @@ def predict_match(student: Student, tutor: Tutor, tutor_stats: Optional[Dict] =
         - compatibility_score: float (0-1)
         - mismatch_scores: dict
     """
-    # Calculate mismatch scores
-    mismatch_scores = calculate_mismatch_scores(student, tutor)
+    key = _prediction_key(student, tutor, tutor_stats)
+    prediction = _prediction_cache.get(key)
+    
+    if prediction is None:
+        # Calculate mismatch scores
+        mismatch_scores = calculate_mismatch_scores(student, tutor)
+        
+        # Calculate compatibility
+        compatibility_score = calculate_compatibility_score(mismatch_scores)
+        
+        # Predict churn risk
+        churn_probability = predict_churn_risk(student, tutor, tutor_stats)
+        
+        # Determine risk level
+        risk_level = determine_risk_level(churn_probability)
+        
+        prediction = {
+            'churn_probability': churn_probability,
+            'risk_level': risk_level,
+            'compatibility_score': compatibility_score,
+            'mismatch_scores': mismatch_scores,
+        }
+        if len(_prediction_cache) >= PREDICTION_CACHE_MAX_ENTRIES:
+            # Evict the oldest entry (dicts keep insertion order)
+            _prediction_cache.pop(next(iter(_prediction_cache)))
+        _prediction_cache[key] = prediction
     
-    # Calculate compatibility
-    compatibility_score = calculate_compatibility_score(mismatch_scores)
+    # Copy so callers can't mutate the memoized result
+    return {**prediction, 'mismatch_scores': dict(prediction['mismatch_scores'])}
+
+
+def predict_match_bulk(
+    student: Student,
+    tutors: Sequence[Tutor],
+    tutor_stats_list: Optional[Sequence[Optional[Dict]]] = None
+) -> List[Dict]:
+    """
+    Predict match quality for one student against many tutors.
+    
+    Mismatch and compatibility scores are computed for all tutors with
+    vectorized NumPy operations, and the model (when available) scores the
+    whole feature matrix in one predict_proba call.
+    
+    Args:
+        student: Student model instance
+        tutors: Tutor model instances
+        tutor_stats_list: Optional tutor statistics, aligned with tutors
+        
+    Returns:
+        List of prediction dictionaries shaped like predict_match output,
+        in the same order as tutors
+    """
+    tutors = list(tutors)
+    if tutor_stats_list is None:
+        tutor_stats_list = [None] * len(tutors)
     
-    # Predict churn risk
-    churn_probability = predict_churn_risk(student, tutor, tutor_stats)
+    if not tutors:
+        return []
+    if np is None:
+        return [
+            predict_match(student, tutor, tutor_stats)
+            for tutor, tutor_stats in zip(tutors, tutor_stats_list)
+        ]
     
-    # Determine risk level
-    risk_level = determine_risk_level(churn_probability)
+    mismatch_matrix = calculate_mismatch_scores_bulk(student, tutors)
+    compatibility_scores = calculate_compatibility_score_bulk(mismatch_matrix)
     
-    return {
-        'churn_probability': churn_probability,
-        'risk_level': risk_level,
-        'compatibility_score': compatibility_score,
-        'mismatch_scores': mismatch_scores,
-    }
+    try:
+        model, feature_names, metadata = load_model()
+    except (FileNotFoundError, ImportError) as e:
+        logger.error(f"Model not available: {e}")
+        # Fallback: churn probability is inverse of compatibility
+        churn_probabilities = 1.0 - compatibility_scores
+    else:
+        feature_matrix = _feature_matrix(
+            student, tutors, tutor_stats_list, feature_names,
+            mismatch_matrix, compatibility_scores
+        )
+        churn_probabilities = model.predict_proba(feature_matrix)[:, 1]
+    
+    return [
+        {
+            'churn_probability': churn_probability,
+            'risk_level': risk_level,
+            'compatibility_score': compatibility_score,
+            'mismatch_scores': mismatch_scores,
+        }
+        for churn_probability, risk_level, compatibility_score, mismatch_scores in zip(
+            churn_probabilities.tolist(),
+            determine_risk_level_bulk(churn_probabilities),
+            compatibility_scores.tolist(),
+            mismatch_rows_to_dicts(mismatch_matrix)
+        )
+    ]
 
 
 def get_or_create_match_prediction(
@@ -217,7 +408,8 @@ def get_or_create_match_prediction(
     student: Student,
     tutor: Tutor,
     tutor_stats: Optional[Dict] = None,
-    force_refresh: bool = False
+    force_refresh: bool = False,
+    prediction_data: Optional[Dict] = None
 ) -> MatchPrediction:
     """
     Get existing match prediction or create new one.
@@ -228,6 +420,8 @@ def get_or_create_match_prediction(
         tutor: Tutor model instance
         tutor_stats: Optional tutor statistics
         force_refresh: If True, recalculate existing predictions (default: False)
+        prediction_data: Optional precomputed prediction (e.g. from
+            predict_match_bulk); computed with predict_match if omitted
         
     Returns:
         MatchPrediction model instance
@@ -238,27 +432,28 @@ def get_or_create_match_prediction(
         MatchPrediction.tutor_id == tutor.id
     ).first()
     
+    if existing and not force_refresh:
+        return existing
+    
     # Generate prediction
-    prediction_data = predict_match(student, tutor, tutor_stats)
+    if prediction_data is None:
+        prediction_data = predict_match(student, tutor, tutor_stats)
     
     if existing:
-        if force_refresh:
-            # Update existing prediction with new data
-            existing.churn_probability = Decimal(str(prediction_data['churn_probability']))
-            existing.risk_level = prediction_data['risk_level']
-            existing.compatibility_score = Decimal(str(prediction_data['compatibility_score']))
-            existing.pace_mismatch = Decimal(str(prediction_data['mismatch_scores']['pace_mismatch']))
-            existing.style_mismatch = Decimal(str(prediction_data['mismatch_scores']['style_mismatch']))
-            existing.communication_mismatch = Decimal(str(prediction_data['mismatch_scores']['communication_mismatch']))
-            existing.age_difference = int(prediction_data['mismatch_scores']['age_difference'])
-            # Clear AI explanation since prediction changed
-            existing.ai_explanation = None
-            db.commit()
-            db.refresh(existing)
-            logger.info(f"Refreshed match prediction for student {student.id} and tutor {tutor.id}")
-            return existing
-        else:
-            return existing
+        # Refresh requested: update existing prediction with new data
+        existing.churn_probability = Decimal(str(prediction_data['churn_probability']))
+        existing.risk_level = prediction_data['risk_level']
+        existing.compatibility_score = Decimal(str(prediction_data['compatibility_score']))
+        existing.pace_mismatch = Decimal(str(prediction_data['mismatch_scores']['pace_mismatch']))
+        existing.style_mismatch = Decimal(str(prediction_data['mismatch_scores']['style_mismatch']))
+        existing.communication_mismatch = Decimal(str(prediction_data['mismatch_scores']['communication_mismatch']))
+        existing.age_difference = int(prediction_data['mismatch_scores']['age_difference'])
+        # Clear AI explanation since prediction changed
+        existing.ai_explanation = None
+        db.commit()
+        db.refresh(existing)
+        logger.info(f"Refreshed match prediction for student {student.id} and tutor {tutor.id}")
+        return existing
     
     # Create new prediction
     match_prediction = MatchPrediction(
@@ -348,9 +543,9 @@ def refresh_student_predictions(db: Session, student_id: str) -> int:
     # Get all tutors
     tutors = db.query(Tutor).all()
     
-    refreshed_count = 0
+    # Get tutor stats
+    tutor_stats_list = []
     for tutor in tutors:
-        # Get tutor stats
         tutor_stats = None
         if tutor.tutor_score:
             tutor_stats = {
@@ -358,9 +553,18 @@ def refresh_student_predictions(db: Session, student_id: str) -> int:
                 'total_sessions_30d': tutor.tutor_score.total_sessions_30d,
                 'is_high_risk': tutor.tutor_score.is_high_risk,
             }
-        
+        tutor_stats_list.append(tutor_stats)
+    
+    # Score the student against every tutor in one vectorized pass
+    predictions = predict_match_bulk(student, tutors, tutor_stats_list)
+    
+    refreshed_count = 0
+    for tutor, tutor_stats, prediction_data in zip(tutors, tutor_stats_list, predictions):
         # Force refresh existing prediction
-        get_or_create_match_prediction(db, student, tutor, tutor_stats, force_refresh=True)
+        get_or_create_match_prediction(
+            db, student, tutor, tutor_stats,
+            force_refresh=True, prediction_data=prediction_data
+        )
         refreshed_count += 1
     
     logger.info(f"Refreshed {refreshed_count} match predictions for student {student_id}")
@@ -2,13 +2,33 @@
 Reschedule rate calculation service.
 """
 from datetime import datetime, timedelta
+from typing import Iterable
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
+from sqlalchemy import func, select, case
 
 from app.models.session import Session as SessionModel
 from app.models.reschedule import Reschedule
 
 
+def rate_from_counts(total_sessions: int, tutor_reschedules: int) -> float:
+    """
+    Turn session counts into a reschedule rate.
+    
+    Args:
+        total_sessions: Sessions in the time window
+        tutor_reschedules: Tutor-initiated reschedules in the time window
+        
+    Returns:
+        Reschedule rate as float (0.0 to 100.0), rounded to 2 decimal places.
+        Returns 0.0 if there are no sessions.
+    """
+    if total_sessions > 0:
+        rate = (tutor_reschedules / total_sessions) * 100.0
+        return round(rate, 2)
+    
+    return 0.0
+
+
 def calculate_reschedule_rate(tutor_id: str, days: int, db: Session) -> float:
     """
     Calculate reschedule rate for a tutor over a specified time window.
@@ -24,40 +44,8 @@ def calculate_reschedule_rate(tutor_id: str, days: int, db: Session) -> float:
         Reschedule rate as float (0.0 to 100.0), rounded to 2 decimal places.
         Returns 0.0 if no sessions exist in the time window.
     """
-    # Calculate start date for the time window
-    start_date = datetime.utcnow() - timedelta(days=days)
-    
-    # Count total sessions in the time window for this tutor
-    total_sessions = db.query(func.count(SessionModel.id)).filter(
-        and_(
-            SessionModel.tutor_id == tutor_id,
-            SessionModel.scheduled_time >= start_date
-        )
-    ).scalar() or 0
-    
-    # If no sessions, return 0.0
-    if total_sessions == 0:
-        return 0.0
-    
-    # Count tutor-initiated reschedules in the time window
-    # Join sessions with reschedules where initiator is 'tutor'
-    tutor_reschedules = db.query(func.count(Reschedule.id)).join(
-        SessionModel,
-        Reschedule.session_id == SessionModel.id
-    ).filter(
-        and_(
-            SessionModel.tutor_id == tutor_id,
-            SessionModel.scheduled_time >= start_date,
-            Reschedule.initiator == 'tutor'
-        )
-    ).scalar() or 0
-    
-    # Calculate rate: (tutor_reschedules / total_sessions) * 100
-    if total_sessions > 0:
-        rate = (tutor_reschedules / total_sessions) * 100.0
-        return round(rate, 2)
-    
-    return 0.0
+    total_sessions, tutor_reschedules = get_session_counts(tutor_id, days, db)
+    return rate_from_counts(total_sessions, tutor_reschedules)
 
 
 def get_session_counts(tutor_id: str, days: int, db: Session) -> tuple[int, int]:
@@ -72,27 +60,50 @@ def get_session_counts(tutor_id: str, days: int, db: Session) -> tuple[int, int]
     Returns:
         Tuple of (total_sessions, tutor_reschedules)
     """
+    counts = get_session_counts_bulk([tutor_id], days, db)
+    return counts.get(str(tutor_id), (0, 0))
+
+
+def get_session_counts_bulk(
+    tutor_ids: Iterable[str], days: int, db: Session
+) -> dict[str, tuple[int, int]]:
+    """
+    Get session and tutor-initiated reschedule counts for many tutors at once.
+    
+    One GROUP BY query over sessions left-joined to reschedules, instead of
+    two COUNT queries per tutor.
+    
+    Args:
+        tutor_ids: UUID strings of the tutors
+        days: Number of days for the time window
+        db: Database session
+        
+    Returns:
+        Dict mapping tutor_id string to (total_sessions, tutor_reschedules).
+        Tutors with no sessions in the window are absent.
+    """
+    tutor_ids = list(tutor_ids)
+    if not tutor_ids:
+        return {}
+    
     start_date = datetime.utcnow() - timedelta(days=days)
     
-    # Count total sessions
-    total_sessions = db.query(func.count(SessionModel.id)).filter(
-        and_(
-            SessionModel.tutor_id == tutor_id,
-            SessionModel.scheduled_time >= start_date
+    rows = db.execute(
+        select(
+            SessionModel.tutor_id,
+            func.count(SessionModel.id),
+            func.count(case((Reschedule.initiator == 'tutor', Reschedule.id)))
         )
-    ).scalar() or 0
-    
-    # Count tutor-initiated reschedules
-    tutor_reschedules = db.query(func.count(Reschedule.id)).join(
-        SessionModel,
-        Reschedule.session_id == SessionModel.id
-    ).filter(
-        and_(
-            SessionModel.tutor_id == tutor_id,
-            SessionModel.scheduled_time >= start_date,
-            Reschedule.initiator == 'tutor'
+        .select_from(SessionModel)
+        .outerjoin(Reschedule, Reschedule.session_id == SessionModel.id)
+        .where(
+            SessionModel.tutor_id.in_(tutor_ids),
+            SessionModel.scheduled_time >= start_date
         )
-    ).scalar() or 0
+        .group_by(SessionModel.tutor_id)
+    ).all()
     
-    return total_sessions, tutor_reschedules
-
+    return {
+        str(tutor_id): (total_sessions, tutor_reschedules)
+        for tutor_id, total_sessions, tutor_reschedules in rows
+    }
@@ -2,16 +2,22 @@
 Score update service for tutor risk scoring.
 """
 from datetime import datetime
-from decimal import Decimal
+from typing import Optional
+from sqlalchemy import func, or_, update
 from sqlalchemy.orm import Session
 
 from app.models.tutor_score import TutorScore
 from app.models.tutor import Tutor
-from app.services.reschedule_calculator import calculate_reschedule_rate, get_session_counts
+from app.services.reschedule_calculator import get_session_counts, rate_from_counts
 from app.utils.cache import invalidate_tutor_score
 
 
-def update_scores_for_tutor(tutor_id: str, db: Session, risk_threshold: float = 15.0) -> TutorScore:
+def update_scores_for_tutor(
+    tutor_id: str,
+    db: Session,
+    risk_threshold: float = 15.0,
+    counts: Optional[dict[int, tuple[int, int]]] = None
+) -> TutorScore:
     """
     Update all reschedule rates and risk flags for a tutor.
     
@@ -22,6 +28,9 @@ def update_scores_for_tutor(tutor_id: str, db: Session, risk_threshold: float =
         tutor_id: UUID string of the tutor
         db: Database session
         risk_threshold: Risk threshold percentage (default 15.0)
+        counts: Optional precomputed (total_sessions, tutor_reschedules) per
+            window in days (7, 30, 90), e.g. from get_session_counts_bulk;
+            missing windows are queried
         
     Returns:
         Updated TutorScore record
@@ -34,15 +43,16 @@ def update_scores_for_tutor(tutor_id: str, db: Session, risk_threshold: float =
     if not tutor:
         raise ValueError(f"Tutor with id {tutor_id} not found")
     
-    # Calculate rates for all time windows
-    rate_7d = calculate_reschedule_rate(tutor_id, 7, db)
-    rate_30d = calculate_reschedule_rate(tutor_id, 30, db)
-    rate_90d = calculate_reschedule_rate(tutor_id, 90, db)
+    # Get counts for all time windows (one query per window not supplied)
+    counts = counts or {}
+    total_7d, reschedules_7d = counts.get(7) or get_session_counts(tutor_id, 7, db)
+    total_30d, reschedules_30d = counts.get(30) or get_session_counts(tutor_id, 30, db)
+    total_90d, reschedules_90d = counts.get(90) or get_session_counts(tutor_id, 90, db)
     
-    # Get counts for all time windows
-    total_7d, reschedules_7d = get_session_counts(tutor_id, 7, db)
-    total_30d, reschedules_30d = get_session_counts(tutor_id, 30, db)
-    total_90d, reschedules_90d = get_session_counts(tutor_id, 90, db)
+    # Derive rates from the same counts
+    rate_7d = rate_from_counts(total_7d, reschedules_7d)
+    rate_30d = rate_from_counts(total_30d, reschedules_30d)
+    rate_90d = rate_from_counts(total_90d, reschedules_90d)
     
     # Get or create TutorScore record
     tutor_score = db.query(TutorScore).filter(TutorScore.tutor_id == tutor_id).first()
@@ -50,7 +60,7 @@ def update_scores_for_tutor(tutor_id: str, db: Session, risk_threshold: float =
     if not tutor_score:
         tutor_score = TutorScore(
             tutor_id=tutor_id,
-            risk_threshold=Decimal(str(risk_threshold))
+            risk_threshold=risk_threshold
         )
         db.add(tutor_score)
     
@@ -92,6 +102,9 @@ def check_risk_flag(tutor_id: str, threshold: float, db: Session) -> bool:
     """
     Check and update risk flag for a tutor.
     
+    The flag is recomputed and written by a single UPDATE ... RETURNING
+    against the row's own risk_threshold, mirroring TutorScore.check_risk_flag.
+    
     Args:
         tutor_id: UUID string of the tutor
         threshold: Risk threshold percentage
@@ -100,14 +113,27 @@ def check_risk_flag(tutor_id: str, threshold: float, db: Session) -> bool:
     Returns:
         True if tutor is high risk, False otherwise
     """
-    tutor_score = db.query(TutorScore).filter(TutorScore.tutor_id == tutor_id).first()
+    is_high_risk = db.execute(
+        update(TutorScore)
+        .where(TutorScore.tutor_id == tutor_id)
+        .values(is_high_risk=or_(*(
+            func.coalesce(rate, 0) > TutorScore.risk_threshold
+            for rate in (
+                TutorScore.reschedule_rate_7d,
+                TutorScore.reschedule_rate_30d,
+                TutorScore.reschedule_rate_90d,
+            )
+        )))
+        .returning(TutorScore.is_high_risk)
+    ).scalar_one_or_none()
     
-    if not tutor_score:
+    if is_high_risk is None:
         return False
     
-    # Update risk flag
-    tutor_score.check_risk_flag()
     db.commit()
     
-    return tutor_score.is_high_risk
+    # Drop the cached score; the next read reloads the committed row
+    invalidate_tutor_score(tutor_id)
+    
+    return is_high_risk
 
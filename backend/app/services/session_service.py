@@ -2,6 +2,8 @@
 Session service for creating and managing sessions.
 """
 import uuid
+from sqlalchemy import insert
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 
@@ -10,47 +12,53 @@ from app.models.reschedule import Reschedule
 from app.models.tutor import Tutor
 from app.schemas.session import SessionCreate
 
+# Tutor ids this process has already seen committed, so create_session can
+# skip the tutor upsert; cleared wholesale when it reaches the cap
+KNOWN_TUTOR_IDS_MAX_ENTRIES = 100_000
+_known_tutor_ids: set = set()
 
-def create_session(session_data: SessionCreate, db: Session) -> SessionModel:
+
+def _insert_or_ignore(db: Session, model):
     """
-    Create a new session record and associated reschedule if applicable.
+    Build an INSERT ... ON CONFLICT (id) DO NOTHING for the session's dialect.
     
     Args:
-        session_data: SessionCreate schema with session data
-        db: Database session
+        db: Database session (selects PostgreSQL or SQLite syntax)
+        model: Model class to insert into
         
     Returns:
-        Created Session record
+        Insert statement to add .values() to
+    """
+    dialect = postgresql if db.get_bind().dialect.name == 'postgresql' else sqlite
+    return dialect.insert(model).on_conflict_do_nothing(index_elements=['id'])
+
+
+def _insert_session_rows(session_data: SessionCreate, db: Session, upsert_tutor: bool) -> None:
+    """
+    Insert the session (and tutor/reschedule rows) and commit.
+    
+    Rows are written with Core INSERTs; the session id is client-supplied,
+    so nothing needs to be read back before the reschedule row.
+    
+    Args:
+        session_data: SessionCreate schema with session data
+        db: Database session
+        upsert_tutor: Whether to create the tutor if it doesn't exist
         
     Raises:
-        ValueError: If session_id is duplicate or tutor_id is invalid
+        ValueError: If session_id is duplicate
         IntegrityError: If database constraint is violated
     """
-    # Note: Validation of reschedule_info is handled in API layer (sessions.py)
-    # This service layer focuses on business logic only
-    
-    # Check if session with this ID already exists
-    existing_session = db.query(SessionModel).filter(
-        SessionModel.id == session_data.session_id
-    ).first()
-    
-    if existing_session:
-        raise ValueError(f"Session with id {session_data.session_id} already exists")
-    
-    # Get or create tutor
-    tutor = db.query(Tutor).filter(Tutor.id == session_data.tutor_id).first()
-    if not tutor:
+    if upsert_tutor:
         # Create tutor if it doesn't exist (per PRD requirement)
-        tutor = Tutor(
+        db.execute(_insert_or_ignore(db, Tutor).values(
             id=session_data.tutor_id,
             name=f"Tutor {str(session_data.tutor_id)[:8]}",  # Default name
             is_active=True
-        )
-        db.add(tutor)
-        db.flush()  # Flush to get tutor ID
+        ))
     
-    # Create session record
-    session = SessionModel(
+    # Create session record; a duplicate id inserts nothing
+    inserted = db.execute(_insert_or_ignore(db, SessionModel).values(
         id=session_data.session_id,
         tutor_id=session_data.tutor_id,
         student_id=session_data.student_id,
@@ -58,10 +66,11 @@ def create_session(session_data: SessionCreate, db: Session) -> SessionModel:
         completed_time=session_data.completed_time,
         status=session_data.status,
         duration_minutes=session_data.duration_minutes
-    )
+    ).returning(SessionModel.id)).first()
     
-    db.add(session)
-    db.flush()  # Flush to get session ID
+    if inserted is None:
+        db.rollback()
+        raise ValueError(f"Session with id {session_data.session_id} already exists")
     
     # Create reschedule record if status is 'rescheduled'
     if session_data.status == 'rescheduled' and session_data.reschedule_info:
@@ -73,8 +82,8 @@ def create_session(session_data: SessionCreate, db: Session) -> SessionModel:
             delta = reschedule_info.original_time - reschedule_info.cancelled_at
             hours_before = delta.total_seconds() / 3600.0
         
-        reschedule = Reschedule(
-            session_id=session.id,
+        db.execute(insert(Reschedule).values(
+            session_id=session_data.session_id,
             initiator=reschedule_info.initiator,
             original_time=reschedule_info.original_time,
             new_time=reschedule_info.new_time,
@@ -82,16 +91,51 @@ def create_session(session_data: SessionCreate, db: Session) -> SessionModel:
             reason_code=reschedule_info.reason_code,
             cancelled_at=reschedule_info.cancelled_at,
             hours_before_session=hours_before
-        )
-        
-        db.add(reschedule)
+        ))
     
     # Commit transaction
+    db.commit()
+
+
+def create_session(session_data: SessionCreate, db: Session) -> SessionModel:
+    """
+    Create a new session record and associated reschedule if applicable.
+    
+    Args:
+        session_data: SessionCreate schema with session data
+        db: Database session
+        
+    Returns:
+        Created Session record
+        
+    Raises:
+        ValueError: If session_id is duplicate or tutor_id is invalid
+        IntegrityError: If database constraint is violated
+    """
+    # Note: Validation of reschedule_info is handled in API layer (sessions.py)
+    # This service layer focuses on business logic only
+    
+    tutor_id = session_data.tutor_id
+    tutor_known = tutor_id in _known_tutor_ids
+    
     try:
-        db.commit()
-        db.refresh(session)
-        return session
+        try:
+            _insert_session_rows(session_data, db, upsert_tutor=not tutor_known)
+        except IntegrityError:
+            if not tutor_known:
+                raise
+            # The tutor may have been deleted since it was cached, so forget
+            # it and retry with the upsert
+            db.rollback()
+            _known_tutor_ids.discard(tutor_id)
+            _insert_session_rows(session_data, db, upsert_tutor=True)
     except IntegrityError as e:
         db.rollback()
         raise ValueError(f"Database constraint violation: {str(e)}") from e
-
+    
+    # Only remember the tutor once its row is committed
+    if len(_known_tutor_ids) >= KNOWN_TUTOR_IDS_MAX_ENTRIES:
+        _known_tutor_ids.clear()
+    _known_tutor_ids.add(tutor_id)
+    
+    return db.get(SessionModel, session_data.session_id)
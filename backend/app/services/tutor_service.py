@@ -3,7 +3,7 @@ Tutor service for querying tutor data.
 """
 from typing import Optional, List, Tuple
 from datetime import datetime, timedelta
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, contains_eager, joinedload
 from sqlalchemy import or_, func, and_
 import logging
 
@@ -41,8 +41,9 @@ def get_tutors(
         Tuple of (list of tutors, total count)
     """
     # Start with base query - use outerjoin to include all tutors (with or without scores)
-    # Then use joinedload to eagerly load the relationship for efficient access
-    query = db.query(Tutor).outerjoin(TutorScore).options(joinedload(Tutor.tutor_score))
+    # The filters and sorting need that join anyway, so populate tutor_score from it
+    # with contains_eager instead of adding a second join or per-tutor lazy loads
+    query = db.query(Tutor).outerjoin(Tutor.tutor_score).options(contains_eager(Tutor.tutor_score))
     
     # Apply search filter (case-insensitive search on name and email)
     if search and search.strip():
@@ -122,6 +123,9 @@ def get_tutor_statistics(tutor_id: str, db: Session) -> dict:
     """
     Get tutor statistics (same as scores but different name for clarity).
     
+    Served from the Redis score cache when present; score updates drop that
+    entry (see score_service), so every process sees fresh statistics.
+    
     Args:
         tutor_id: UUID string of the tutor
         db: Database session
@@ -129,12 +133,19 @@ def get_tutor_statistics(tutor_id: str, db: Session) -> dict:
     Returns:
         Dictionary with statistics
     """
+    cached_score = get_tutor_score(tutor_id)
+    if cached_score:
+        return cached_score
+    
     tutor_score = db.query(TutorScore).filter(TutorScore.tutor_id == tutor_id).first()
     
     if not tutor_score:
         return {}
     
-    return tutor_score.to_dict()
+    stats = tutor_score.to_dict()
+    set_tutor_score(tutor_id, stats)
+    
+    return stats
 
 
 def get_tutor_history(tutor_id: str, days: int, limit: int, db: Session) -> Tuple[List[Reschedule], dict]:
@@ -150,7 +161,8 @@ def get_tutor_history(tutor_id: str, days: int, limit: int, db: Session) -> Tupl
     Returns:
         Tuple of (list of reschedules, trend dictionary)
     """
-    start_date = datetime.utcnow() - timedelta(days=days)
+    current_date = datetime.utcnow()
+    start_date = current_date - timedelta(days=days)
     
     # Get reschedules for this tutor
     reschedules = db.query(Reschedule).join(
@@ -168,7 +180,6 @@ def get_tutor_history(tutor_id: str, days: int, limit: int, db: Session) -> Tupl
     trend_data = []
     
     # Calculate weekly buckets
-    current_date = datetime.utcnow()
     for week_offset in range(days // 7, -1, -1):
         week_start = current_date - timedelta(days=week_offset * 7)
         week_end = week_start + timedelta(days=7)
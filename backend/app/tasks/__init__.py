@@ -4,6 +4,6 @@ Celery tasks package.
 from app.tasks.celery_app import celery_app
 
 # Import tasks to register them with Celery
-from app.tasks import session_processor, email_tasks
+from app.tasks import session_processor, email_tasks, nightly_score_refresh
 
 __all__ = ['celery_app']
@@ -2,6 +2,8 @@
 Celery application configuration
 """
 from celery import Celery
+from celery.schedules import crontab
+from celery.signals import worker_process_init, worker_process_shutdown
 import os
 
 celery_app = Celery(
@@ -19,5 +21,30 @@ celery_app.conf.update(
     task_track_started=True,
     task_time_limit=300,  # 5 minutes max
     task_soft_time_limit=240,  # 4 minutes soft limit
+    beat_schedule={
+        "refresh-tutor-scores-nightly": {
+            "task": "app.tasks.nightly_score_refresh.refresh_all_tutor_scores",
+            "schedule": crontab(hour=2, minute=0),  # 02:00 UTC
+        },
+    },
 )
 
+
+@worker_process_init.connect
+def reset_db_pool(**kwargs):
+    """
+    Give each forked worker process its own database connection pool.
+    
+    Prefork children inherit the parent's pooled sockets; discarding them
+    (without closing, since the parent still owns them) makes the child
+    open fresh connections on first use.
+    """
+    from app.utils.database import engine
+    engine.dispose(close=False)
+
+
+@worker_process_shutdown.connect
+def close_db_pool(**kwargs):
+    """Close pooled database connections when a worker process exits."""
+    from app.utils.database import engine
+    engine.dispose()
@@ -3,18 +3,22 @@ Email sending Celery tasks.
 """
 import os
 import logging
-from datetime import datetime
+from typing import List
+from sqlalchemy import func, insert
 from sqlalchemy.orm import Session
 from dotenv import load_dotenv
 
 from app.tasks.celery_app import celery_app
 from app.utils.database import SessionLocal
 from app.models.email_report import EmailReport
-from app.services.email_report_service import send_session_report
+from app.services.email_report_service import send_session_report, send_session_reports
 
 logger = logging.getLogger(__name__)
 load_dotenv()
 
+# Recipient for session reports, read once at import
+ADMIN_EMAIL = os.getenv("ADMIN_EMAIL")
+
 
 @celery_app.task(bind=True, max_retries=3)
 def send_email_report(self, session_id: str):
@@ -37,70 +41,158 @@ def send_email_report(self, session_id: str):
         # Create new database session for this task
         db = SessionLocal()
         
-        logger.info(f"Sending email report for session {session_id}")
+        logger.info("Sending email report for session %s", session_id)
         
-        # Get recipient email from environment
-        recipient_email = os.getenv("ADMIN_EMAIL")
+        # Get recipient email (read from environment at import)
+        recipient_email = ADMIN_EMAIL
         if not recipient_email:
             raise ValueError("ADMIN_EMAIL environment variable is not set")
         
         # Send email report
         success = send_session_report(session_id, recipient_email, db)
         
-        # Create EmailReport record
-        email_report = EmailReport(
-            session_id=session_id,
-            recipient_email=recipient_email,
-            sent_at=datetime.utcnow(),  # Always set timestamp, even for failures (audit trail)
-            status="sent" if success else "failed",
-            error_message=None
-        )
-        
-        db.add(email_report)
+        # Create EmailReport audit row (Core insert; no ORM object to refresh)
+        email_report_id = db.execute(
+            insert(EmailReport).values(
+                session_id=session_id,
+                recipient_email=recipient_email,
+                sent_at=func.now(),  # Always set timestamp, even for failures (audit trail); stamped by the DB
+                status="sent" if success else "failed",
+                error_message=None
+            ).returning(EmailReport.id)
+        ).scalar_one()
         db.commit()
-        db.refresh(email_report)
         
         if success:
-            logger.info(f"Email report sent successfully for session {session_id}")
+            logger.info("Email report sent successfully for session %s", session_id)
             return {
                 "status": "success",
                 "session_id": session_id,
-                "email_report_id": str(email_report.id)
+                "email_report_id": str(email_report_id)
             }
         else:
-            logger.error(f"Failed to send email report for session {session_id}")
+            logger.error("Failed to send email report for session %s", session_id)
             return {
                 "status": "failed",
                 "session_id": session_id,
-                "email_report_id": str(email_report.id)
+                "email_report_id": str(email_report_id)
             }
         
     except Exception as exc:
-        logger.error(f"Error sending email report for session {session_id}: {str(exc)}")
+        logger.error("Error sending email report for session %s: %s", session_id, exc)
         
         # Create failed EmailReport record
         if db:
             try:
-                recipient_email = os.getenv("ADMIN_EMAIL", "unknown")
-                email_report = EmailReport(
-                    session_id=session_id,
-                    recipient_email=recipient_email,
-                    sent_at=datetime.utcnow(),  # Always set timestamp, even for failures (audit trail)
-                    status="failed",
-                    error_message=str(exc)
+                db.rollback()
+                db.execute(
+                    insert(EmailReport).values(
+                        session_id=session_id,
+                        recipient_email=ADMIN_EMAIL or "unknown",
+                        sent_at=func.now(),  # Always set timestamp, even for failures (audit trail); stamped by the DB
+                        status="failed",
+                        error_message=str(exc)
+                    )
                 )
-                db.add(email_report)
                 db.commit()
             except Exception as e:
-                logger.error(f"Failed to create EmailReport record: {str(e)}")
+                logger.error("Failed to create EmailReport record: %s", e)
+        
+        # Retry with exponential backoff
+        if self.request.retries < self.max_retries:
+            countdown = 60 * (self.request.retries + 1)  # 60, 120, 180 seconds
+            logger.info(
+                "Retrying email report for session %s in %s seconds (attempt %s/%s)",
+                session_id, countdown, self.request.retries + 1, self.max_retries
+            )
+            raise self.retry(exc=exc, countdown=countdown)
+        else:
+            logger.error("Max retries exceeded for email report session %s", session_id)
+            raise exc
+    
+    finally:
+        # Close database session
+        if db:
+            db.close()
+
+
+@celery_app.task(bind=True, max_retries=3)
+def send_email_reports_bulk(self, session_ids: List[str]):
+    """
+    Send email reports for many sessions in one task.
+    
+    This task:
+    1. Loads all sessions with their tutors and scores in one query
+    2. Sends every email through a single email service instance
+    3. Creates all EmailReport records with one executemany INSERT
+    
+    Sessions that do not exist are skipped (they cannot be referenced by
+    an EmailReport row) and listed in the result.
+    
+    Args:
+        session_ids: UUID strings of the sessions
+        
+    Returns:
+        dict: Status message with sent/failed counts and missing session_ids
+    """
+    db: Session = None
+    try:
+        # Create new database session for this task
+        db = SessionLocal()
+        
+        logger.info("Sending email reports for %s sessions", len(session_ids))
+        
+        # Get recipient email (read from environment at import)
+        recipient_email = ADMIN_EMAIL
+        if not recipient_email:
+            raise ValueError("ADMIN_EMAIL environment variable is not set")
+        
+        results = send_session_reports(session_ids, recipient_email, db)
+        
+        if results:
+            # One audit row per email; sent_at is stamped by the DB for every row
+            db.execute(
+                insert(EmailReport).values(sent_at=func.now()),
+                [
+                    {
+                        "session_id": session_id,
+                        "recipient_email": recipient_email,
+                        "status": "sent" if success else "failed",
+                        "error_message": None
+                    }
+                    for session_id, success in results.items()
+                ]
+            )
+            db.commit()
+        
+        missing = [session_id for session_id in session_ids if str(session_id) not in results]
+        if missing:
+            logger.warning("Skipped email reports for %s missing sessions", len(missing))
+        
+        sent = sum(results.values())
+        return {
+            "status": "success",
+            "sent": sent,
+            "failed": len(results) - sent,
+            "missing": missing
+        }
+        
+    except Exception as exc:
+        logger.error("Error sending bulk email reports: %s", exc)
+        
+        if db:
+            db.rollback()
         
         # Retry with exponential backoff
         if self.request.retries < self.max_retries:
             countdown = 60 * (self.request.retries + 1)  # 60, 120, 180 seconds
-            logger.info(f"Retrying email report for session {session_id} in {countdown} seconds (attempt {self.request.retries + 1}/{self.max_retries})")
+            logger.info(
+                "Retrying bulk email reports in %s seconds (attempt %s/%s)",
+                countdown, self.request.retries + 1, self.max_retries
+            )
             raise self.retry(exc=exc, countdown=countdown)
         else:
-            logger.error(f"Max retries exceeded for email report session {session_id}")
+            logger.error("Max retries exceeded for bulk email reports")
             raise exc
     
     finally:
@@ -0,0 +1,78 @@
+"""
+Nightly tutor score refresh Celery task.
+"""
+import logging
+from sqlalchemy.orm import Session
+
+from app.tasks.celery_app import celery_app
+from app.utils.database import SessionLocal
+from app.models.tutor import Tutor
+from app.services.reschedule_calculator import get_session_counts_bulk
+from app.services.score_service import update_scores_for_tutor
+
+logger = logging.getLogger(__name__)
+
+# Time windows (days) stored on TutorScore
+SCORE_WINDOWS = (7, 30, 90)
+
+
+@celery_app.task(bind=True, max_retries=3, time_limit=3600, soft_time_limit=3300)
+def refresh_all_tutor_scores(self):
+    """
+    Recalculate scores for every active tutor.
+
+    Session and reschedule counts for all tutors are aggregated with one
+    GROUP BY query per window, then handed to update_scores_for_tutor so
+    the per-tutor write path issues no count queries of its own. Scheduled
+    nightly by Celery beat (see celery_app.beat_schedule); dashboard reads
+    then only look up the stored TutorScore rows.
+
+    Returns:
+        dict: Status message with the number of tutors refreshed
+    """
+    db: Session = None
+    try:
+        # Create new database session for this task
+        db = SessionLocal()
+
+        tutor_ids = [str(tutor_id) for (tutor_id,) in db.query(Tutor.id).filter(Tutor.is_active == True)]
+        logger.info("Refreshing scores for %d tutors", len(tutor_ids))
+
+        counts_by_window = {
+            days: get_session_counts_bulk(tutor_ids, days, db)
+            for days in SCORE_WINDOWS
+        }
+
+        for tutor_id in tutor_ids:
+            counts = {
+                days: window_counts.get(tutor_id, (0, 0))
+                for days, window_counts in counts_by_window.items()
+            }
+            update_scores_for_tutor(tutor_id, db, counts=counts)
+
+        logger.info("Refreshed scores for %d tutors", len(tutor_ids))
+
+        return {
+            "status": "success",
+            "tutors_refreshed": len(tutor_ids)
+        }
+
+    except Exception as exc:
+        logger.exception("Error refreshing tutor scores")
+
+        # Retry with exponential backoff
+        if self.request.retries < self.max_retries:
+            countdown = 300 * (self.request.retries + 1)  # 5, 10, 15 minutes
+            logger.info(
+                "Retrying score refresh in %d seconds (attempt %d/%d)",
+                countdown, self.request.retries + 1, self.max_retries
+            )
+            raise self.retry(exc=exc, countdown=countdown)
+        else:
+            logger.error("Max retries exceeded for score refresh")
+            raise exc
+
+    finally:
+        # Close database session
+        if db:
+            db.close()
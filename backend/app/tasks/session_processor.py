@@ -2,6 +2,8 @@
 Session processing Celery tasks.
 """
 import logging
+from typing import List
+from celery import chain
 from sqlalchemy.orm import Session
 
 from app.tasks.celery_app import celery_app
@@ -17,12 +19,14 @@ logger = logging.getLogger(__name__)
 @celery_app.task(bind=True, max_retries=3)
 def process_session(self, session_id: str):
     """
-    Process a completed session: calculate scores and send email report.
+    Process a completed session: calculate scores.
     
     This task:
     1. Fetches the session record
     2. Recalculates tutor scores (reschedule rates)
-    3. Queues email report task
+    
+    The email report is linked after this task by enqueue_session(), so the
+    broker hands off to send_email_report once scoring succeeds.
     
     Args:
         session_id: UUID string of the session to process
@@ -37,13 +41,14 @@ def process_session(self, session_id: str):
         
         logger.info(f"Processing session {session_id}")
         
-        # Fetch session record
-        session = db.query(SessionModel).filter(SessionModel.id == session_id).first()
+        # Fetch session record and associated tutor in a single round trip
+        session, tutor = db.query(SessionModel, Tutor).outerjoin(
+            Tutor,
+            Tutor.id == SessionModel.tutor_id
+        ).filter(SessionModel.id == session_id).first() or (None, None)
         if not session:
             raise ValueError(f"Session {session_id} not found")
         
-        # Fetch associated tutor
-        tutor = db.query(Tutor).filter(Tutor.id == session.tutor_id).first()
         if not tutor:
             raise ValueError(f"Tutor {session.tutor_id} not found for session {session_id}")
         
@@ -52,14 +57,6 @@ def process_session(self, session_id: str):
         tutor_score = update_scores_for_tutor(str(tutor.id), db)
         logger.info(f"Updated scores for tutor {tutor.id}: is_high_risk={tutor_score.is_high_risk}")
         
-        # Queue email report task
-        try:
-            send_email_report.delay(session_id)
-            logger.info(f"Queued email report task for session {session_id}")
-        except Exception as e:
-            logger.error(f"Failed to queue email report task for session {session_id}: {str(e)}")
-            # Continue anyway - score update is done
-        
         logger.info(f"Successfully processed session {session_id}")
         
         return {
@@ -85,3 +82,49 @@ def process_session(self, session_id: str):
         # Close database session
         if db:
             db.close()
+
+
+def enqueue_session(session_id: str, **options):
+    """
+    Queue a session for processing followed by its email report.
+    
+    Builds a chain of process_session -> send_email_report so the broker
+    performs the hand-off instead of the scoring worker. Immutable
+    signatures are used so the email task does not receive the
+    process_session result as an argument.
+    
+    Args:
+        session_id: UUID string of the session to process
+        **options: Extra options passed to apply_async (e.g. producer)
+        
+    Returns:
+        AsyncResult of the chain
+    """
+    return chain(
+        process_session.si(session_id),
+        send_email_report.si(session_id)
+    ).apply_async(**options)
+
+
+def bulk_enqueue_sessions(session_ids: List[str]) -> List:
+    """
+    Queue many sessions for processing over a single broker connection.
+    
+    Producers that enqueue sessions in a loop (e.g. nightly backfills) would
+    otherwise acquire a connection and pay a broker round trip per task.
+    Acquiring one producer from the pool and reusing it for every chain
+    keeps the publishes on the same connection.
+    
+    Args:
+        session_ids: UUID strings of the sessions to process
+        
+    Returns:
+        List of AsyncResult objects, one per session
+    """
+    results = []
+    with celery_app.producer_or_acquire() as producer:
+        for session_id in session_ids:
+            results.append(enqueue_session(session_id, producer=producer))
+    
+    logger.info(f"Queued {len(results)} sessions for processing")
+    return results
@@ -2,7 +2,7 @@
 Redis caching utilities for performance optimization.
 """
 import os
-import json
+import time
 import logging
 from typing import Optional, Any
 from dotenv import load_dotenv
@@ -12,27 +12,111 @@ load_dotenv()
 
 # Redis client (lazy initialization)
 _redis_client = None
+# Monotonic deadline before which Redis is assumed to be unavailable
+_redis_down_until = 0.0
+
+# Connection pool settings
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "64"))
+REDIS_HEALTH_CHECK_INTERVAL = int(os.getenv("REDIS_HEALTH_CHECK_INTERVAL", "30"))
+# Seconds to skip reconnect attempts after Redis fails
+REDIS_RETRY_BACKOFF = int(os.getenv("REDIS_RETRY_BACKOFF", "30"))
+
+# Server-side SCAN + UNLINK of every key matching KEYS[1], in one round trip
+_UNLINK_MATCHING_LUA = """
+local cursor = "0"
+repeat
+    local res = redis.call("SCAN", cursor, "MATCH", KEYS[1], "COUNT", 500)
+    cursor = res[1]
+    if #res[2] > 0 then
+        redis.call("UNLINK", unpack(res[2]))
+    end
+until cursor == "0"
+return 1
+"""
+# Registered script (EVALSHA with EVAL fallback), created on first use
+_unlink_matching_script = None
 
 
 def get_redis_client():
-    """Get or create Redis client."""
-    global _redis_client
+    """
+    Get or create Redis client backed by a bounded connection pool.
+    
+    After a failed connection attempt, returns None without retrying until
+    REDIS_RETRY_BACKOFF seconds have passed.
+    """
+    global _redis_client, _redis_down_until
     
     if _redis_client is None:
+        if time.monotonic() < _redis_down_until:
+            return None
+        
         try:
             import redis
             redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
-            _redis_client = redis.from_url(redis_url, decode_responses=True)
-            # Test connection
-            _redis_client.ping()
+            # decode_responses must be set on the pool; Redis() ignores it
+            # when an explicit connection_pool is passed
+            pool = redis.ConnectionPool.from_url(
+                redis_url,
+                max_connections=REDIS_MAX_CONNECTIONS,
+                socket_keepalive=True,
+                health_check_interval=REDIS_HEALTH_CHECK_INTERVAL,
+                retry_on_timeout=True,
+                decode_responses=True,
+            )
+            client = redis.Redis(connection_pool=pool)
+            # Test connection before publishing the client
+            client.ping()
+            _redis_client = client
+            _redis_down_until = 0.0
             logger.info("Redis cache client initialized")
         except Exception as e:
-            logger.warning(f"Redis cache not available: {str(e)}")
+            _redis_down_until = time.monotonic() + REDIS_RETRY_BACKOFF
+            logger.warning(f"Redis cache not available, retrying in {REDIS_RETRY_BACKOFF}s: {str(e)}")
             return None
     
     return _redis_client
 
 
+# Field types for tutor score hashes (values come back from Redis as strings)
+TUTOR_SCORE_FIELD_TYPES = {
+    'id': str,
+    'tutor_id': str,
+    'reschedule_rate_7d': float,
+    'reschedule_rate_30d': float,
+    'reschedule_rate_90d': float,
+    'total_sessions_7d': int,
+    'total_sessions_30d': int,
+    'total_sessions_90d': int,
+    'tutor_reschedules_7d': int,
+    'tutor_reschedules_30d': int,
+    'tutor_reschedules_90d': int,
+    'is_high_risk': bool,
+    'risk_threshold': float,
+    'last_calculated_at': str,
+    'created_at': str,
+    'updated_at': str,
+}
+
+
+def _encode_hash_value(value: Any) -> str:
+    """Encode a score value for storage in a Redis hash field."""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    return str(value)
+
+
+def _decode_hash_value(field: str, value: str) -> Any:
+    """Decode a Redis hash field back to its score value type."""
+    if value == "":
+        return None
+    field_type = TUTOR_SCORE_FIELD_TYPES.get(field, str)
+    if field_type is bool:
+        return value == "1"
+    return field_type(value)
+
+
 def get_tutor_score(tutor_id: str) -> Optional[dict]:
     """
     Get cached tutor score.
@@ -49,9 +133,9 @@ def get_tutor_score(tutor_id: str) -> Optional[dict]:
     
     try:
         key = f"tutor_score:{tutor_id}"
-        cached = client.get(key)
+        cached = client.hgetall(key)
         if cached:
-            return json.loads(cached)
+            return {field: _decode_hash_value(field, value) for field, value in cached.items()}
     except Exception as e:
         logger.warning(f"Error getting cached tutor score: {str(e)}")
     
@@ -60,7 +144,7 @@ def get_tutor_score(tutor_id: str) -> Optional[dict]:
 
 def set_tutor_score(tutor_id: str, score: dict, ttl: int = 300) -> bool:
     """
-    Cache tutor score.
+    Cache tutor score as a Redis hash.
     
     Args:
         tutor_id: UUID string of the tutor
@@ -76,7 +160,10 @@ def set_tutor_score(tutor_id: str, score: dict, ttl: int = 300) -> bool:
     
     try:
         key = f"tutor_score:{tutor_id}"
-        client.setex(key, ttl, json.dumps(score, default=str))
+        pipe = client.pipeline()
+        pipe.hset(key, mapping={field: _encode_hash_value(value) for field, value in score.items()})
+        pipe.expire(key, ttl)
+        pipe.execute()
         return True
     except Exception as e:
         logger.warning(f"Error caching tutor score: {str(e)}")
@@ -119,11 +206,13 @@ def invalidate_all_tutor_scores() -> bool:
     if not client:
         return False
     
+    global _unlink_matching_script
+    
     try:
-        # Get all keys matching pattern
-        keys = client.keys("tutor_score:*")
-        if keys:
-            client.delete(*keys)
+        # Scan and unlink matching keys on the server instead of KEYS + DEL
+        if _unlink_matching_script is None:
+            _unlink_matching_script = client.register_script(_UNLINK_MATCHING_LUA)
+        _unlink_matching_script(keys=["tutor_score:*"])
         return True
     except Exception as e:
         logger.warning(f"Error invalidating all tutor scores: {str(e)}")
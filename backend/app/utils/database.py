@@ -1,8 +1,12 @@
 """
-Database session management for FastAPI.
+Database session management for FastAPI and Celery tasks.
+
+Tasks must open their own session with SessionLocal() per invocation and
+close it when done; never cache a Session across tasks. Celery worker
+processes reset the engine's pool after fork (see app.tasks.celery_app).
 """
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, Session
 from dotenv import load_dotenv
 
@@ -17,22 +21,41 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 if not DATABASE_URL:
     raise ValueError("DATABASE_URL environment variable is not set")
 
-# Create database engine
+# Pool sizing (size DB_POOL_SIZE to API workers / Celery concurrency)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+# Statement timeout for API request sessions only (see get_db); Celery tasks
+# and scripts run long batch queries and keep the server default
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "5000"))
+
+# Create database engine (shared by the API, Celery tasks and scripts so
+# connections and dialect initialization are reused rather than re-probed)
 engine = create_engine(
     DATABASE_URL,
     pool_pre_ping=True,  # Verify connections before using
-    pool_size=5,
-    max_overflow=10,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_recycle=DB_POOL_RECYCLE,  # Recycle before server-side idle timeouts
 )
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+def _set_statement_timeout(session, transaction, connection):
+    """Apply DB_STATEMENT_TIMEOUT_MS to the transaction that just began."""
+    connection.exec_driver_sql(f"SET LOCAL statement_timeout = {DB_STATEMENT_TIMEOUT_MS}")
+
+
 def get_db() -> Session:
     """
     Dependency function for FastAPI to get database session.
     
+    On PostgreSQL every transaction the session begins is limited to
+    DB_STATEMENT_TIMEOUT_MS via SET LOCAL, so the timeout never leaks onto
+    pooled connections later used by Celery tasks or scripts.
+    
     Yields:
         Session: SQLAlchemy database session
         
@@ -42,6 +65,8 @@ def get_db() -> Session:
             return db.query(Item).all()
     """
     db = SessionLocal()
+    if engine.dialect.name == "postgresql":
+        event.listen(db, "after_begin", _set_statement_timeout)
     try:
         yield db
     finally:
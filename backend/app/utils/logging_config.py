@@ -5,18 +5,57 @@ import os
 import logging
 import sys
 import json
-from datetime import datetime
+from datetime import datetime, timezone
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 load_dotenv()
 
 
+def _dumps(data: dict) -> str:
+    """Serialize a log record dict, preferring orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(data).decode()
+    return json.dumps(data)
+
+
 class JSONFormatter(logging.Formatter):
     """JSON formatter for structured logging."""
     
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # (epoch second, formatted "YYYY-MM-DDTHH:MM:SS") for the last record
+        self._ts_cache = (None, "")
+    
+    def _format_timestamp(self, created: float) -> str:
+        """
+        Format a record timestamp as ISO 8601 UTC.
+        
+        The date/time part only changes once per second, so it is cached and
+        just the microseconds are formatted per record.
+        
+        Args:
+            created: record.created (seconds since the epoch)
+            
+        Returns:
+            ISO 8601 timestamp string with microseconds and UTC offset
+        """
+        second = int(created)
+        cached_second, prefix = self._ts_cache
+        if second != cached_second:
+            prefix = datetime.fromtimestamp(second, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+            self._ts_cache = (second, prefix)
+        micros = min(round((created - second) * 1_000_000), 999_999)
+        return f"{prefix}.{micros:06d}+00:00"
+    
     def format(self, record):
         log_data = {
-            "timestamp": datetime.utcnow().isoformat(),
+            # record.created is stamped when the record is made; no extra clock read
+            "timestamp": self._format_timestamp(record.created),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -33,7 +72,7 @@ class JSONFormatter(logging.Formatter):
         if hasattr(record, "extra_data"):
             log_data.update(record.extra_data)
         
-        return json.dumps(log_data)
+        return _dumps(log_data)
 
 
 def setup_logging():
@@ -4,29 +4,116 @@ Generate sample tutor data for testing.
 """
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from decimal import Decimal
-import random
+
+import numpy as np
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
 from app.models import Base, Tutor, Session, Reschedule
 
+# Reschedule reason codes and their descriptions
+REASONS = {
+    "personal": "Personal conflict",
+    "sick": "Feeling unwell",
+    "emergency": "Family emergency",
+    "technical": "Technical issues",
+    "other": "Other reason"
+}
+REASON_CODES = list(REASONS)
+INITIATORS = ["tutor", "student"]
+
+# Tutors seeded concurrently, each on its own database session
+SEED_WORKERS = 4
+
+
+def seed_tutor_sessions(tutor_id, student_ids, rng, now):
+    """
+    Create 20-50 sessions (and their reschedules) for one tutor.
+    
+    Runs in a worker thread, so it opens and commits its own database
+    session rather than sharing the caller's.
+    
+    Args:
+        tutor_id: UUID of an already committed tutor
+        student_ids: Student IDs to pick from
+        rng: NumPy Generator owned by this call
+        now: Reference time for scheduling
+        
+    Returns:
+        Tuple of (session count, reschedule count)
+    """
+    from app.utils.database import SessionLocal
+    db = SessionLocal()
+    
+    try:
+        # Draw all random values for this tutor's 20-50 sessions at once
+        num_sessions = int(rng.integers(20, 51))
+        days_ago = rng.integers(0, 91, size=num_sessions)  # last 90 days
+        will_reschedule = rng.random(num_sessions) < 0.2  # 20% chance
+        student_picks = rng.choice(student_ids, size=num_sessions)
+        hours_before = rng.uniform(1.0, 72.0, size=num_sessions)  # 1-72 hours
+        new_days = rng.integers(1, 8, size=num_sessions)  # 1-7 days later
+        initiators = rng.choice(INITIATORS, size=num_sessions)
+        reason_codes = rng.choice(REASON_CODES, size=num_sessions)
+        reschedule_count = int(will_reschedule.sum())
+        
+        with db.no_autoflush:
+            for j in range(num_sessions):
+                scheduled_time = now - timedelta(days=int(days_ago[j]))
+                rescheduled = bool(will_reschedule[j])
+                
+                session = Session(
+                    tutor_id=tutor_id,
+                    student_id=str(student_picks[j]),
+                    scheduled_time=scheduled_time,
+                    status="rescheduled" if rescheduled else "completed",
+                    duration_minutes=60
+                )
+                
+                if not rescheduled:
+                    session.completed_time = scheduled_time + timedelta(minutes=60)
+                
+                db.add(session)
+                
+                # Create reschedule if applicable
+                if rescheduled:
+                    hours = float(hours_before[j])
+                    reason_code = str(reason_codes[j])
+                    
+                    reschedule = Reschedule(
+                        session=session,
+                        initiator=str(initiators[j]),
+                        original_time=scheduled_time,
+                        new_time=scheduled_time + timedelta(days=int(new_days[j])),
+                        reason=REASONS[reason_code],
+                        reason_code=reason_code,
+                        cancelled_at=scheduled_time - timedelta(hours=hours),
+                        hours_before_session=round(hours, 2)
+                    )
+                    
+                    db.add(reschedule)
+        
+        # Write this tutor's batch in one flush and commit
+        db.commit()
+        return num_sessions, reschedule_count
+    
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
 
 def generate_sample_data():
     """Generate sample data for testing."""
     print("🌱 Generating sample data...")
     
-    # Get database connection from environment
-    database_url = os.getenv("DATABASE_URL")
-    if not database_url:
-        raise ValueError("DATABASE_URL environment variable is not set")
-    
-    engine = create_engine(database_url)
-    SessionLocal = sessionmaker(bind=engine)
+    # Reuse the application's engine and session factory
+    # (raises ValueError if DATABASE_URL is not set)
+    from app.utils.database import SessionLocal
     db = SessionLocal()
     
     try:
@@ -57,82 +144,32 @@ def generate_sample_data():
                 is_active=True
             )
             db.add(tutor)
-            db.commit()
-            db.refresh(tutor)
             tutors.append(tutor)
             print(f"  Created tutor: {name}")
         
+        # Commit tutors so the worker sessions can reference them
+        db.commit()
         print(f"✅ Created {len(tutors)} tutors")
         
         # Create sessions and reschedules for each tutor
         print("📝 Creating sessions and reschedules...")
         
-        for tutor in tutors:
-            # Create 20-50 sessions per tutor
-            num_sessions = random.randint(20, 50)
-            reschedule_count = 0
-            
-            for j in range(num_sessions):
-                # Random date in the last 90 days
-                days_ago = random.randint(0, 90)
-                scheduled_time = datetime.utcnow() - timedelta(days=days_ago)
-                
-                # Randomly decide if this session will be rescheduled (20% chance)
-                will_reschedule = random.random() < 0.2
-                
-                session = Session(
-                    tutor_id=tutor.id,
-                    student_id=random.choice(student_ids),
-                    scheduled_time=scheduled_time,
-                    status="rescheduled" if will_reschedule else "completed",
-                    duration_minutes=60
-                )
-                
-                if not will_reschedule:
-                    session.completed_time = scheduled_time + timedelta(minutes=60)
-                
-                db.add(session)
-                db.commit()
-                db.refresh(session)
-                
-                # Create reschedule if applicable
-                if will_reschedule:
-                    # Random hours before session (1-72 hours)
-                    hours_before = Decimal(str(random.uniform(1.0, 72.0)))
-                    cancelled_at = scheduled_time - timedelta(hours=float(hours_before))
-                    
-                    # Random new time (1-7 days later)
-                    new_time = scheduled_time + timedelta(days=random.randint(1, 7))
-                    
-                    # Random initiator and reason
-                    initiator = random.choice(["tutor", "student"])
-                    reason_codes = ["personal", "sick", "emergency", "technical", "other"]
-                    reason_code = random.choice(reason_codes)
-                    
-                    reasons = {
-                        "personal": "Personal conflict",
-                        "sick": "Feeling unwell",
-                        "emergency": "Family emergency",
-                        "technical": "Technical issues",
-                        "other": "Other reason"
-                    }
-                    
-                    reschedule = Reschedule(
-                        session_id=session.id,
-                        initiator=initiator,
-                        original_time=scheduled_time,
-                        new_time=new_time,
-                        reason=reasons[reason_code],
-                        reason_code=reason_code,
-                        cancelled_at=cancelled_at,
-                        hours_before_session=hours_before
-                    )
-                    
-                    db.add(reschedule)
-                    reschedule_count += 1
-            
-            db.commit()
-            print(f"  {tutor.name}: {num_sessions} sessions ({reschedule_count} reschedules)")
+        tutor_ids = [tutor.id for tutor in tutors]
+        # Generators are not thread-safe; give each tutor an independent stream
+        rngs = [np.random.default_rng(seed) for seed in np.random.SeedSequence().spawn(len(tutors))]
+        now = datetime.utcnow()
+        
+        with ThreadPoolExecutor(max_workers=SEED_WORKERS) as executor:
+            results = list(executor.map(
+                seed_tutor_sessions,
+                tutor_ids,
+                [student_ids] * len(tutors),
+                rngs,
+                [now] * len(tutors)
+            ))
+        
+        for name, (num_sessions, reschedule_count) in zip(tutor_names, results):
+            print(f"  {name}: {num_sessions} sessions ({reschedule_count} reschedules)")
         
         print("")
         print("✅ Sample data generated successfully!")
@@ -1,15 +1,7 @@
 """
 Tests for health check endpoint.
 """
-import pytest
-from fastapi.testclient import TestClient
-
-from app.main import app
-
-@pytest.fixture
-def client():
-    """Test client fixture."""
-    return TestClient(app)
+from tests.helpers import _json
 
 
 def test_health_check_success(client, db_session, monkeypatch):
@@ -22,7 +14,7 @@ def test_health_check_success(client, db_session, monkeypatch):
     
     response = client.get("/api/health")
     assert response.status_code == 200
-    data = response.json()
+    data = _json(response)
     assert data["status"] == "healthy"
     assert "database" in data
     assert "version" in data
@@ -37,7 +29,7 @@ def test_health_check_includes_all_statuses(client, db_session, monkeypatch):
     
     response = client.get("/api/health")
     assert response.status_code == 200
-    data = response.json()
+    data = _json(response)
     assert "database" in data
     assert "redis" in data
 
@@ -2,16 +2,13 @@
 Tests for matching service API endpoints.
 """
 import pytest
-from fastapi.testclient import TestClient
 from uuid import uuid4
 from decimal import Decimal
 
-from app.main import app
 from app.models.student import Student
 from app.models.tutor import Tutor
 from app.models.match_prediction import MatchPrediction
-
-client = TestClient(app)
+from tests.helpers import _json
 
 
 @pytest.fixture
@@ -28,7 +25,6 @@ def test_student(db_session):
     )
     db_session.add(student)
     db_session.commit()
-    db_session.refresh(student)
     return student
 
 
@@ -47,32 +43,24 @@ def test_tutor(db_session):
     )
     db_session.add(tutor)
     db_session.commit()
-    db_session.refresh(tutor)
     return tutor
 
 
-@pytest.fixture
-def api_key():
-    """Get API key for testing."""
-    import os
-    return os.getenv("API_KEY", "test-api-key")
-
-
 class TestStudentEndpoints:
     """Test student endpoints."""
     
-    def test_get_students_empty(self, api_key):
+    def test_get_students_empty(self, client, api_key):
         """Test getting students when none exist."""
         response = client.get(
             "/api/matching/students",
             headers={"X-API-Key": api_key}
         )
         assert response.status_code == 200
-        data = response.json()
+        data = _json(response)
         assert data["total"] == 0
         assert data["students"] == []
     
-    def test_create_student(self, api_key, db_session):
+    def test_create_student(self, client, api_key):
         """Test creating a student."""
         student_data = {
             "name": "New Student",
@@ -89,22 +77,22 @@ class TestStudentEndpoints:
             headers={"X-API-Key": api_key}
         )
         assert response.status_code == 201
-        data = response.json()
+        data = _json(response)
         assert data["name"] == "New Student"
         assert data["age"] == 14
     
-    def test_get_student_by_id(self, api_key, test_student):
+    def test_get_student_by_id(self, client, api_key, test_student):
         """Test getting student by ID."""
         response = client.get(
             f"/api/matching/students/{test_student.id}",
             headers={"X-API-Key": api_key}
         )
         assert response.status_code == 200
-        data = response.json()
+        data = _json(response)
         assert data["id"] == str(test_student.id)
         assert data["name"] == "Test Student"
     
-    def test_get_student_not_found(self, api_key):
+    def test_get_student_not_found(self, client, api_key):
         """Test getting non-existent student."""
         fake_id = uuid4()
         response = client.get(
@@ -117,29 +105,29 @@ class TestStudentEndpoints:
 class TestTutorEndpoints:
     """Test tutor endpoints."""
     
-    def test_get_tutors(self, api_key, test_tutor):
+    def test_get_tutors(self, client, api_key, test_tutor):
         """Test getting tutors."""
         response = client.get(
             "/api/matching/tutors",
             headers={"X-API-Key": api_key}
         )
         assert response.status_code == 200
-        data = response.json()
+        data = _json(response)
         assert len(data) >= 1
         assert any(t["id"] == str(test_tutor.id) for t in data)
     
-    def test_get_tutor_by_id(self, api_key, test_tutor):
+    def test_get_tutor_by_id(self, client, api_key, test_tutor):
         """Test getting tutor by ID."""
         response = client.get(
             f"/api/matching/tutors/{test_tutor.id}",
             headers={"X-API-Key": api_key}
         )
         assert response.status_code == 200
-        data = response.json()
+        data = _json(response)
         assert data["id"] == str(test_tutor.id)
         assert data["name"] == "Test Tutor"
     
-    def test_update_tutor_preferences(self, api_key, test_tutor):
+    def test_update_tutor_preferences(self, client, api_key, test_tutor):
         """Test updating tutor preferences."""
         update_data = {
             "preferred_pace": 4,
@@ -151,7 +139,7 @@ class TestTutorEndpoints:
             headers={"X-API-Key": api_key}
         )
         assert response.status_code == 200
-        data = response.json()
+        data = _json(response)
         assert data["preferred_pace"] == 4
         assert data["confidence_level"] == 5
 
@@ -159,14 +147,14 @@ class TestTutorEndpoints:
 class TestMatchPredictionEndpoints:
     """Test match prediction endpoints."""
     
-    def test_get_match_prediction(self, api_key, test_student, test_tutor, db_session):
+    def test_get_match_prediction(self, client, api_key, test_student, test_tutor):
         """Test getting match prediction."""
         response = client.get(
             f"/api/matching/predict/{test_student.id}/{test_tutor.id}",
             headers={"X-API-Key": api_key}
         )
         assert response.status_code == 200
-        data = response.json()
+        data = _json(response)
         assert data["student_id"] == str(test_student.id)
         assert data["tutor_id"] == str(test_tutor.id)
         assert "churn_probability" in data
@@ -174,7 +162,7 @@ class TestMatchPredictionEndpoints:
         assert "compatibility_score" in data
         assert data["risk_level"] in ["low", "medium", "high"]
     
-    def test_get_match_prediction_not_found_student(self, api_key, test_tutor):
+    def test_get_match_prediction_not_found_student(self, client, api_key, test_tutor):
         """Test getting prediction with non-existent student."""
         fake_id = uuid4()
         response = client.get(
@@ -183,7 +171,7 @@ class TestMatchPredictionEndpoints:
         )
         assert response.status_code == 404
     
-    def test_get_match_prediction_not_found_tutor(self, api_key, test_student):
+    def test_get_match_prediction_not_found_tutor(self, client, api_key, test_student):
         """Test getting prediction with non-existent tutor."""
         fake_id = uuid4()
         response = client.get(
@@ -192,7 +180,7 @@ class TestMatchPredictionEndpoints:
         )
         assert response.status_code == 404
     
-    def test_get_student_matches(self, api_key, test_student, test_tutor, db_session):
+    def test_get_student_matches(self, client, api_key, test_student, test_tutor):
         """Test getting all matches for a student."""
         # Create a prediction first
         response = client.get(
@@ -207,11 +195,11 @@ class TestMatchPredictionEndpoints:
             headers={"X-API-Key": api_key}
         )
         assert response.status_code == 200
-        data = response.json()
+        data = _json(response)
         assert data["total"] >= 1
         assert len(data["matches"]) >= 1
     
-    def test_get_tutor_matches(self, api_key, test_student, test_tutor, db_session):
+    def test_get_tutor_matches(self, client, api_key, test_student, test_tutor):
         """Test getting all matches for a tutor."""
         # Create a prediction first
         response = client.get(
@@ -226,7 +214,7 @@ class TestMatchPredictionEndpoints:
             headers={"X-API-Key": api_key}
         )
         assert response.status_code == 200
-        data = response.json()
+        data = _json(response)
         assert data["total"] >= 1
         assert len(data["matches"]) >= 1
 
@@ -234,13 +222,13 @@ class TestMatchPredictionEndpoints:
 class TestAuthentication:
     """Test authentication requirements."""
     
-    def test_endpoints_require_api_key(self):
+    def test_endpoints_require_api_key(self, client):
         """Test that endpoints require API key."""
         # Test without API key
         response = client.get("/api/matching/students")
         assert response.status_code == 401
     
-    def test_endpoints_with_invalid_api_key(self):
+    def test_endpoints_with_invalid_api_key(self, client):
         """Test that endpoints reject invalid API key."""
         response = client.get(
             "/api/matching/students",
@@ -1,113 +1,109 @@
 """
 Tests for session ingestion endpoints.
 """
+import json
 import pytest
 from datetime import datetime, timedelta
 from uuid import uuid4
-from fastapi.testclient import TestClient
-from unittest.mock import patch, MagicMock
+from unittest.mock import MagicMock
+from freezegun import freeze_time
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-from app.main import app
 from app.models.session import Session as SessionModel
 from app.models.tutor import Tutor
 from app.models.reschedule import Reschedule
-
-@pytest.fixture
-def client():
-    """Test client fixture."""
-    return TestClient(app)
+from tests.helpers import _json, TEST_API_KEY
+
+# Fixed clock for every test in this module; payload timestamps are
+# precomputed from it instead of calling utcnow()/isoformat() per request.
+# Sessions are scheduled in the past so the API skips the prediction step
+NOW = datetime(2024, 1, 15, 12, 0, 0)
+NOW_ISO = NOW.isoformat()
+HOUR_AGO = NOW - timedelta(hours=1)
+HOUR_AGO_ISO = HOUR_AGO.isoformat()
+
+# Completed-session body shared by the create tests; each test adds its own
+# session_id and tutor_id
+BASE_PAYLOAD = {
+    "student_id": "student_123",
+    "scheduled_time": HOUR_AGO_ISO,
+    "completed_time": NOW_ISO,
+    "status": "completed",
+    "duration_minutes": 60
+}
+
+# BASE_PAYLOAD serialized once; tests substitute their ids into the bytes
+# and post them as-is instead of re-encoding a dict per request
+_TEMPLATE_PAYLOAD = {**BASE_PAYLOAD, "session_id": "__SID__", "tutor_id": "__TID__"}
+if orjson is not None:
+    _BODY_TEMPLATE = orjson.dumps(_TEMPLATE_PAYLOAD)
+else:
+    _BODY_TEMPLATE = json.dumps(_TEMPLATE_PAYLOAD).encode()
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def _session_body(session_id, tutor_id) -> bytes:
+    """Return the pre-serialized BASE_PAYLOAD body for the given ids."""
+    return (
+        _BODY_TEMPLATE
+        .replace(b"__SID__", str(session_id).encode())
+        .replace(b"__TID__", str(tutor_id).encode())
+    )
 
 
-@pytest.fixture
-def api_key():
-    """API key for authenticated requests."""
-    import os
-    os.environ["API_KEY"] = "test-api-key"
-    return "test-api-key"
+@pytest.fixture(autouse=True)
+def frozen_clock():
+    """Freeze datetime.utcnow() at NOW for the duration of each test."""
+    with freeze_time(NOW):
+        yield
 
 
-def test_create_session_success(client, db_session, sample_tutor, api_key, monkeypatch):
-    """Test successful session creation."""
+@pytest.mark.parametrize("headers,expected", [
+    ({**JSON_HEADERS, "X-API-Key": TEST_API_KEY}, 202),
+    (JSON_HEADERS, 401),
+])
+def test_create_session(client, db_session, sample_tutor, monkeypatch, headers, expected):
+    """Test session creation with and without an API key."""
     session_id = uuid4()
     tutor_id = sample_tutor.id
+    mock_enqueue = MagicMock()
+    monkeypatch.setattr('app.api.sessions.enqueue_session', mock_enqueue)
     
-    # Mock Celery task
-    with patch('app.api.sessions.process_session.delay') as mock_task:
-        mock_task.return_value = None
-        
-        response = client.post(
-            "/api/sessions",
-            headers={"X-API-Key": api_key},
-            json={
-                "session_id": str(session_id),
-                "tutor_id": str(tutor_id),
-                "student_id": "student_123",
-                "scheduled_time": datetime.utcnow().isoformat(),
-                "completed_time": (datetime.utcnow() + timedelta(hours=1)).isoformat(),
-                "status": "completed",
-                "duration_minutes": 60
-            }
-        )
-        
-        assert response.status_code == 202
-        data = response.json()
-        assert data["id"] == str(session_id)
-        assert data["tutor_id"] == str(tutor_id)
-        assert data["status"] == "completed"
-        
-        # Verify Celery task was queued
-        mock_task.assert_called_once()
-        
-        # Verify session was created in database
-        session = db_session.query(SessionModel).filter(SessionModel.id == session_id).first()
-        assert session is not None
-
-
-def test_create_session_with_reschedule(client, db_session, sample_tutor, api_key, monkeypatch):
+    response = client.post(
+        "/api/sessions",
+        headers=headers,
+        content=_session_body(session_id, tutor_id)
+    )
+    
+    assert response.status_code == expected
+    if expected != 202:
+        mock_enqueue.assert_not_called()
+        return
+    
+    data = _json(response)
+    assert data["id"] == str(session_id)
+    assert data["tutor_id"] == str(tutor_id)
+    assert data["status"] == "completed"
+    
+    # Verify Celery chain was queued
+    mock_enqueue.assert_called_once()
+    
+    # Verify session was created in database
+    session = db_session.get(SessionModel, session_id)
+    assert session is not None
+
+
+def test_create_session_with_reschedule(client, db_session, sample_tutor, api_key):
     """Test session creation with reschedule info."""
     session_id = uuid4()
     tutor_id = sample_tutor.id
-    original_time = datetime.utcnow()
+    original_time = HOUR_AGO
     new_time = original_time + timedelta(days=1)
     
-    with patch('app.api.sessions.process_session.delay') as mock_task:
-        mock_task.return_value = None
-        
-        response = client.post(
-            "/api/sessions",
-            headers={"X-API-Key": api_key},
-            json={
-                "session_id": str(session_id),
-                "tutor_id": str(tutor_id),
-                "student_id": "student_123",
-                "scheduled_time": original_time.isoformat(),
-                "status": "rescheduled",
-                "reschedule_info": {
-                    "initiator": "tutor",
-                    "original_time": original_time.isoformat(),
-                    "new_time": new_time.isoformat(),
-                    "reason": "Personal emergency",
-                    "cancelled_at": (original_time - timedelta(hours=12)).isoformat()
-                }
-            }
-        )
-        
-        assert response.status_code == 202
-        data = response.json()
-        assert data["status"] == "rescheduled"
-        
-        # Verify reschedule was created
-        session = db_session.query(SessionModel).filter(SessionModel.id == session_id).first()
-        assert session is not None
-        assert session.reschedule is not None
-        assert session.reschedule.initiator == "tutor"
-
-
-def test_create_session_missing_reschedule_info(client, db_session, sample_tutor, api_key):
-    """Test session creation fails when rescheduled status but no reschedule_info."""
-    session_id = uuid4()
-    tutor_id = sample_tutor.id
-    
     response = client.post(
         "/api/sessions",
         headers={"X-API-Key": api_key},
@@ -115,70 +111,68 @@ def test_create_session_missing_reschedule_info(client, db_session, sample_tutor
             "session_id": str(session_id),
             "tutor_id": str(tutor_id),
             "student_id": "student_123",
-            "scheduled_time": datetime.utcnow().isoformat(),
-            "status": "rescheduled"
-            # Missing reschedule_info
+            "scheduled_time": HOUR_AGO_ISO,
+            "status": "rescheduled",
+            "reschedule_info": {
+                "initiator": "tutor",
+                "original_time": HOUR_AGO_ISO,
+                "new_time": new_time.isoformat(),
+                "reason": "Personal emergency",
+                "cancelled_at": (original_time - timedelta(hours=12)).isoformat()
+            }
         }
     )
     
-    assert response.status_code == 400
+    assert response.status_code == 202
+    data = _json(response)
+    assert data["status"] == "rescheduled"
+    
+    # Verify reschedule was created
+    session = db_session.get(SessionModel, session_id)
+    assert session is not None
+    assert session.reschedule is not None
+    assert session.reschedule.initiator == "tutor"
 
 
-def test_create_session_duplicate_id(client, db_session, sample_tutor, api_key, monkeypatch):
-    """Test session creation fails with duplicate session_id."""
+def test_create_session_missing_reschedule_info(client, sample_tutor, api_key):
+    """Test session creation fails when rescheduled status but no reschedule_info."""
     session_id = uuid4()
     tutor_id = sample_tutor.id
     
-    # Create first session
-    with patch('app.api.sessions.process_session.delay'):
-        client.post(
-            "/api/sessions",
-            headers={"X-API-Key": api_key},
-            json={
-                "session_id": str(session_id),
-                "tutor_id": str(tutor_id),
-                "student_id": "student_123",
-                "scheduled_time": datetime.utcnow().isoformat(),
-                "status": "completed"
-            }
-        )
-    
-    # Try to create duplicate
     response = client.post(
         "/api/sessions",
         headers={"X-API-Key": api_key},
         json={
             "session_id": str(session_id),
             "tutor_id": str(tutor_id),
-            "student_id": "student_456",
-            "scheduled_time": datetime.utcnow().isoformat(),
-            "status": "completed"
+            "student_id": "student_123",
+            "scheduled_time": HOUR_AGO_ISO,
+            "status": "rescheduled"
+            # Missing reschedule_info
         }
     )
     
     assert response.status_code == 400
 
 
-def test_create_session_unauthorized(client, db_session, sample_tutor):
-    """Test session creation fails without API key."""
+def test_create_session_duplicate_id(client, sample_tutor, api_key):
+    """Test session creation fails with duplicate session_id."""
     session_id = uuid4()
     tutor_id = sample_tutor.id
     
-    response = client.post(
-        "/api/sessions",
-        json={
-            "session_id": str(session_id),
-            "tutor_id": str(tutor_id),
-            "student_id": "student_123",
-            "scheduled_time": datetime.utcnow().isoformat(),
-            "status": "completed"
-        }
-    )
+    # Create first session
+    headers = {**JSON_HEADERS, "X-API-Key": api_key}
+    body = _session_body(session_id, tutor_id)
+    first = client.post("/api/sessions", headers=headers, content=body)
+    assert first.status_code == 202
     
-    assert response.status_code == 401
+    # Try to create duplicate
+    response = client.post("/api/sessions", headers=headers, content=body)
+    
+    assert response.status_code == 400
 
 
-def test_create_session_invalid_data(client, db_session, sample_tutor, api_key):
+def test_create_session_invalid_data(client, sample_tutor, api_key):
     """Test session creation fails with invalid data."""
     response = client.post(
         "/api/sessions",
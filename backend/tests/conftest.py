@@ -2,29 +2,44 @@
 Pytest configuration and fixtures.
 """
 import pytest
+import pytest_asyncio
 import os
 from datetime import datetime, timedelta
-from sqlalchemy import create_engine, event
+from sqlalchemy import create_engine, delete, event, text
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 from sqlalchemy.dialects.sqlite import BLOB
 from dotenv import load_dotenv
+from fastapi.testclient import TestClient
+from httpx import AsyncClient, ASGITransport
 
 # Load environment variables
 load_dotenv()
 
+from tests.helpers import TEST_API_KEY, _insert_returning, unique_suffix
 from app.models import Base, Tutor, Session, Reschedule, TutorScore, EmailReport, Student, MatchPrediction
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.types import TypeDecorator, CHAR
 from decimal import Decimal
 import uuid
 
+# The app modules read DATABASE_URL at import; without it only tests that
+# don't touch the API or Celery tasks can run
+try:
+    from app.main import app
+    from app.utils.database import get_db
+    from app.tasks import email_tasks, nightly_score_refresh, session_processor
+    from app.tasks.celery_app import celery_app
+    from app.services import session_service
+except ValueError:
+    app = None
+
 
 # Use PostgreSQL test database (same as production)
 # Fall back to SQLite if DATABASE_URL not set (for CI/CD)
 TEST_DATABASE_URL = os.getenv('DATABASE_URL', 'sqlite:///:memory:')
 
-
 class GUID(TypeDecorator):
     """Platform-independent GUID type for SQLite compatibility."""
     impl = CHAR
@@ -55,132 +70,339 @@ class GUID(TypeDecorator):
             return value
 
 
-@pytest.fixture(scope="function")
-def db_session():
+def _patch_uuid_columns():
+    """Swap PostgreSQL UUID column types for GUID (once) when testing on SQLite."""
+    if 'sqlite' not in TEST_DATABASE_URL or Base.metadata.info.get('_patched'):
+        return
+    for table in Base.metadata.tables.values():
+        for col in table.columns:
+            if isinstance(col.type, PG_UUID):
+                col.type = GUID()
+    Base.metadata.info['_patched'] = True
+
+
+# Map UUID to GUID for SQLite compatibility before any engine is built
+_patch_uuid_columns()
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--run-slow", action="store_true", default=False,
+        help="also run tests marked slow"
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "slow: slow, DB-heavy test; needs --run-slow")
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip tests marked slow unless --run-slow is given."""
+    if config.getoption("--run-slow"):
+        return
+    skip_slow = pytest.mark.skip(reason="need --run-slow option to run")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
+
+
+@pytest.fixture(scope="session")
+def monkeypatch_session():
+    """Session-scoped counterpart of the built-in monkeypatch fixture."""
+    with pytest.MonkeyPatch.context() as mp:
+        yield mp
+
+
+@pytest.fixture(scope="session", autouse=True)
+def api_key(monkeypatch_session):
+    """Set API_KEY once for the session and return it for request headers."""
+    monkeypatch_session.setenv("API_KEY", TEST_API_KEY)
+    return TEST_API_KEY
+
+
+@pytest.fixture(scope="session")
+def db_engine():
     """
-    Create a fresh database session for each test.
+    Create the test engine and schema once per test session.
     Uses PostgreSQL if available, otherwise SQLite.
-    """
-    # Map UUID to GUID for SQLite compatibility
-    if 'sqlite' in TEST_DATABASE_URL:
-        # Replace UUID columns with GUID for SQLite
-        for table in Base.metadata.tables.values():
-            for col in table.columns:
-                if isinstance(col.type, PG_UUID):
-                    col.type = GUID()
     
+    Safe under pytest-xdist: each worker process builds its own engine, and
+    on PostgreSQL its tables live in a per-worker schema (test_gw0, ...).
+    """
     if 'sqlite' in TEST_DATABASE_URL:
+        # One shared in-memory database; it disappears with the engine
         engine = create_engine(
-            TEST_DATABASE_URL,
+            "sqlite://",
             connect_args={"check_same_thread": False},
             poolclass=StaticPool,
         )
+        
+        # pysqlite's own transaction handling breaks SAVEPOINT; let
+        # SQLAlchemy emit BEGIN itself. Foreign keys are enforced as on
+        # PostgreSQL, so constraint errors surface inside the test SAVEPOINT
+        @event.listens_for(engine, "connect")
+        def _disable_pysqlite_begin(dbapi_connection, connection_record):
+            dbapi_connection.isolation_level = None
+            dbapi_connection.execute("PRAGMA foreign_keys=ON")
+        
+        @event.listens_for(engine, "begin")
+        def _emit_begin(conn):
+            conn.exec_driver_sql("BEGIN")
     else:
-        engine = create_engine(TEST_DATABASE_URL)
+        # One schema per pytest-xdist worker so parallel runs don't share tables
+        worker_id = os.environ.get("PYTEST_XDIST_WORKER", "gw0")
+        schema = f"test_{worker_id}"
+        # Large insertmanyvalues pages so bulk test inserts go out in one
+        # multi-row INSERT; psycopg2 also batches executemany UPDATE/DELETE
+        engine_kwargs = {"insertmanyvalues_page_size": 1000}
+        if make_url(TEST_DATABASE_URL).get_driver_name() == "psycopg2":
+            engine_kwargs["executemany_mode"] = "values_plus_batch"
+        base_engine = create_engine(TEST_DATABASE_URL, **engine_kwargs)
+        with base_engine.begin() as conn:
+            conn.execute(text(f'CREATE SCHEMA IF NOT EXISTS "{schema}"'))
+        engine = base_engine.execution_options(schema_translate_map={None: schema})
     
     Base.metadata.create_all(engine)
-    SessionLocal = sessionmaker(bind=engine)
-    session = SessionLocal()
+    
+    # No drop_all: every test's data is rolled back, and an in-memory
+    # database is discarded with the engine
+    try:
+        yield engine
+    finally:
+        engine.dispose()
+
+
+def _bind_app_sessions(session_factory, monkeypatch):
+    """
+    Point the app's own sessions (API get_db, Celery tasks) at the test
+    connection so they see fixture data and are rolled back with it.
+    """
+    if app is None:
+        return
+    
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+    
+    monkeypatch.setitem(app.dependency_overrides, get_db, override_get_db)
+    monkeypatch.setattr(email_tasks, "SessionLocal", session_factory)
+    monkeypatch.setattr(session_processor, "SessionLocal", session_factory)
+    monkeypatch.setattr(nightly_score_refresh, "SessionLocal", session_factory)
+    # Tutors created by a test are rolled back with it, so start each test
+    # with an empty known-tutor cache
+    monkeypatch.setattr(session_service, "_known_tutor_ids", set())
+
+
+@pytest.fixture(scope="module")
+def db_connection(db_engine):
+    """
+    Connection shared by one test module, inside a transaction that is
+    rolled back when the module finishes.
+    """
+    connection = db_engine.connect()
+    trans = connection.begin()
+    
+    try:
+        yield connection
+    finally:
+        trans.rollback()
+        connection.close()
+
+
+@pytest.fixture(scope="module")
+def db_session_module(db_connection):
+    """
+    Session for module-scoped fixture data.
+    
+    expire_on_commit=False keeps the seeded objects' loaded state so tests
+    can merge them into their own session without a reload.
+    """
+    session = sessionmaker(
+        bind=db_connection,
+        join_transaction_mode="create_savepoint",
+        expire_on_commit=False,
+    )()
+    
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture(scope="function", autouse=True)
+def db_session(db_connection, monkeypatch):
+    """
+    Database session for one test, rolled back afterwards.
+    
+    Autouse, so every test (including ones that only go through the API
+    client or tasks) runs inside its own SAVEPOINT.
+    
+    The test runs inside a SAVEPOINT on the module connection; commit() only
+    releases a nested SAVEPOINT, so nothing outlives the test while
+    module-scoped fixture rows stay visible.
+    
+    The test's own session keeps loaded state across commit()
+    (expire_on_commit=False), so tests don't refresh() after inserting;
+    sessions the app opens through the same factory keep the default.
+    """
+    savepoint = db_connection.begin_nested()
+    TestingSessionLocal = sessionmaker(bind=db_connection, join_transaction_mode="create_savepoint")
+    session = TestingSessionLocal(expire_on_commit=False)
+    _bind_app_sessions(TestingSessionLocal, monkeypatch)
     
     try:
         yield session
     finally:
         session.close()
-        # Only drop tables if using test database
-        if 'sqlite' in TEST_DATABASE_URL or 'test' in TEST_DATABASE_URL.lower():
-            Base.metadata.drop_all(engine)
+        if savepoint.is_active:
+            savepoint.rollback()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def offline_services(monkeypatch_session):
+    """
+    Keep the whole session off Redis and SendGrid without per-test mocks.
+    
+    Celery publishes to an in-memory broker/result backend, so enqueueing
+    from the API is a cheap no-op, and EMAIL_SERVICE=null makes
+    get_email_service() return NullEmailService.
+    """
+    monkeypatch_session.setenv("EMAIL_SERVICE", "null")
+    if app is not None:
+        celery_app.conf.update(
+            task_always_eager=False,
+            broker_url="memory://",
+            result_backend="cache+memory://",
+            task_store_eager_result=True,
+        )
+
+
+@pytest.fixture(scope="session")
+def client():
+    """
+    Test client shared by the whole test session.
+    
+    Entered as a context manager so startup/shutdown events run once. Tests
+    that need dependency overrides set app.dependency_overrides (and clear
+    them) instead of building their own client.
+    """
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest_asyncio.fixture
+async def async_client():
+    """Async HTTP client calling the app in-process over ASGI."""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        yield ac
+
+
+@pytest.fixture(scope="session", autouse=True)
+def sample_tutor_session(db_engine):
+    """
+    Create the sample tutor row once for the whole test session.
+    
+    Autouse so the row is committed before any module connection opens;
+    every module's transaction then sees it, and the per-test SAVEPOINT
+    rollback undoes whatever a test changes on it. Deleted at session end.
+    """
+    unique_id = unique_suffix()
+    with db_engine.connect() as connection:
+        session = sessionmaker(bind=connection, expire_on_commit=False)()
+        try:
+            tutor = _insert_returning(session, Tutor, {
+                "name": f"John Doe {unique_id}",
+                "email": f"john.doe.{unique_id}@example.com",
+                "is_active": True
+            })
+        finally:
+            session.close()
+    
+    try:
+        yield tutor
+    finally:
+        with db_engine.begin() as connection:
+            connection.execute(delete(Tutor).where(Tutor.id == tutor.id))
 
 
 @pytest.fixture
-def sample_tutor(db_session):
-    """Create a sample tutor for testing."""
-    import uuid
-    unique_id = str(uuid.uuid4())[:8]
-    tutor = Tutor(
-        name=f"John Doe {unique_id}",
-        email=f"john.doe.{unique_id}@example.com",
-        is_active=True
-    )
-    db_session.add(tutor)
-    db_session.commit()
-    db_session.refresh(tutor)
-    return tutor
+def sample_tutor(db_session, sample_tutor_session):
+    """Sample tutor for testing, attached to the test's session."""
+    return db_session.merge(sample_tutor_session, load=False)
+
+
+@pytest.fixture(scope="module")
+def sample_session_module(db_session_module, sample_tutor_session):
+    """Create the sample session row once per test module."""
+    unique_id = unique_suffix()
+    now = datetime.utcnow()
+    return _insert_returning(db_session_module, Session, {
+        "tutor_id": sample_tutor_session.id,
+        "student_id": f"student_{unique_id}",
+        "scheduled_time": now,
+        "completed_time": now + timedelta(minutes=60),
+        "status": "completed",
+        "duration_minutes": 60
+    })
 
 
 @pytest.fixture
-def sample_session(db_session, sample_tutor):
-    """Create a sample session for testing."""
-    import uuid
-    unique_id = str(uuid.uuid4())[:8]
-    session = Session(
-        tutor_id=sample_tutor.id,
-        student_id=f"student_{unique_id}",
-        scheduled_time=datetime.utcnow(),
-        completed_time=datetime.utcnow() + timedelta(minutes=60),
-        status="completed",
-        duration_minutes=60
-    )
-    db_session.add(session)
-    db_session.commit()
-    db_session.refresh(session)
-    return session
+def sample_session(db_session, sample_session_module):
+    """Sample session for testing, attached to the test's session."""
+    return db_session.merge(sample_session_module, load=False)
 
 
 @pytest.fixture
 def sample_reschedule(db_session, sample_session):
     """Create a sample reschedule for testing."""
-    reschedule = Reschedule(
-        session_id=sample_session.id,
-        initiator="tutor",
-        original_time=sample_session.scheduled_time,
-        new_time=sample_session.scheduled_time + timedelta(days=1),
-        reason="Personal emergency",
-        reason_code="personal",
-        cancelled_at=sample_session.scheduled_time - timedelta(hours=12),
-        hours_before_session=Decimal("12.00")
-    )
-    db_session.add(reschedule)
-    db_session.commit()
-    db_session.refresh(reschedule)
-    return reschedule
+    return _insert_returning(db_session, Reschedule, {
+        "session_id": sample_session.id,
+        "initiator": "tutor",
+        "original_time": sample_session.scheduled_time,
+        "new_time": sample_session.scheduled_time + timedelta(days=1),
+        "reason": "Personal emergency",
+        "reason_code": "personal",
+        "cancelled_at": sample_session.scheduled_time - timedelta(hours=12),
+        "hours_before_session": 12.0
+    })
 
 
 @pytest.fixture
 def sample_tutor_score(db_session, sample_tutor):
     """Create a sample tutor score for testing."""
-    tutor_score = TutorScore(
-        tutor_id=sample_tutor.id,
-        reschedule_rate_7d=Decimal("5.00"),
-        reschedule_rate_30d=Decimal("8.50"),
-        reschedule_rate_90d=Decimal("10.00"),
-        total_sessions_7d=20,
-        total_sessions_30d=80,
-        total_sessions_90d=200,
-        tutor_reschedules_7d=1,
-        tutor_reschedules_30d=7,
-        tutor_reschedules_90d=20,
-        is_high_risk=False,
-        risk_threshold=Decimal("15.00"),
-        last_calculated_at=datetime.utcnow()
-    )
-    db_session.add(tutor_score)
-    db_session.commit()
-    db_session.refresh(tutor_score)
-    return tutor_score
+    return _insert_returning(db_session, TutorScore, {
+        "tutor_id": sample_tutor.id,
+        "reschedule_rate_7d": Decimal("5.00"),
+        "reschedule_rate_30d": Decimal("8.50"),
+        "reschedule_rate_90d": Decimal("10.00"),
+        "total_sessions_7d": 20,
+        "total_sessions_30d": 80,
+        "total_sessions_90d": 200,
+        "tutor_reschedules_7d": 1,
+        "tutor_reschedules_30d": 7,
+        "tutor_reschedules_90d": 20,
+        "is_high_risk": False,
+        "risk_threshold": Decimal("15.00"),
+        "last_calculated_at": datetime.utcnow()
+    })
 
 
-@pytest.fixture
-def sample_email_report(db_session, sample_session):
-    """Create a sample email report for testing."""
-    email_report = EmailReport(
-        session_id=sample_session.id,
-        recipient_email="admin@example.com",
-        sent_at=datetime.utcnow(),
-        status="sent",
-        error_message=None
-    )
-    db_session.add(email_report)
-    db_session.commit()
-    db_session.refresh(email_report)
-    return email_report
+@pytest.fixture(scope="module")
+def sample_email_report_module(db_session_module, sample_session_module):
+    """Create the sample email report row once per test module."""
+    return _insert_returning(db_session_module, EmailReport, {
+        "session_id": sample_session_module.id,
+        "recipient_email": "admin@example.com",
+        "sent_at": datetime.utcnow(),
+        "status": "sent",
+        "error_message": None
+    })
 
+
+@pytest.fixture
+def sample_email_report(db_session, sample_email_report_module):
+    """Sample email report for testing, attached to the test's session."""
+    return db_session.merge(sample_email_report_module, load=False)
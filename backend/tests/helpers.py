@@ -0,0 +1,100 @@
+"""
+Shared test helpers (plain functions and constants; fixtures live in conftest).
+"""
+import itertools
+from contextlib import contextmanager
+from datetime import timedelta
+from sqlalchemy import event, insert
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from app.models import Reschedule
+
+# API key accepted by the app for the whole test session
+TEST_API_KEY = "test-api-key"
+
+# Monotonic source of unique name/email suffixes (no urandom per fixture)
+_suffix_counter = itertools.count()
+
+
+def unique_suffix() -> str:
+    """Return a short suffix unique within this test process."""
+    return f"{next(_suffix_counter):08x}"
+
+
+def _json(response):
+    """Decode a response body, using orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+@contextmanager
+def count_queries(connection):
+    """
+    Collect the SQL statements executed on a connection inside the block.
+    
+    Used to assert query budgets, e.g. that a relationship is loaded without
+    N+1 SELECTs. An executemany is recorded once per statement, however many
+    round trips the driver makes for it:
+    
+        with count_queries(db_session.connection()) as queries:
+            ...
+        assert len(queries) <= 2
+    """
+    queries = []
+    
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        queries.append(statement)
+    
+    event.listen(connection, "before_cursor_execute", _before_cursor_execute)
+    try:
+        yield queries
+    finally:
+        event.remove(connection, "before_cursor_execute", _before_cursor_execute)
+
+
+def _insert_returning(session, model, values):
+    """
+    Insert one row with a Core-level INSERT ... RETURNING and commit.
+    
+    Returns the persistent ORM object built from the returned row, so there is
+    no unit-of-work flush or follow-up refresh SELECT.
+    """
+    obj = session.scalars(insert(model).returning(model), [values]).one()
+    session.commit()
+    return obj
+
+
+# Compiled once by SQLAlchemy's statement cache and reused by make_reschedule
+_RESCHEDULE_INSERT = insert(Reschedule).returning(Reschedule)
+
+
+def make_reschedule(session, sample, hours_before=12, **overrides):
+    """
+    Insert a reschedule for a session row with INSERT ... RETURNING (no commit).
+    
+    Args:
+        session: Database session to insert with
+        sample: Session model instance being rescheduled
+        hours_before: Hours before scheduled_time the reschedule was made,
+            also stored as hours_before_session
+        **overrides: Column values replacing the defaults
+        
+    Returns:
+        The persistent Reschedule instance
+    """
+    cancelled_at = sample.scheduled_time - timedelta(hours=hours_before)
+    values = {
+        "session_id": sample.id,
+        "initiator": "tutor",
+        "original_time": sample.scheduled_time,
+        "cancelled_at": cancelled_at,
+        "created_at": cancelled_at,
+        "hours_before_session": float(hours_before),
+        **overrides
+    }
+    return session.scalars(_RESCHEDULE_INSERT, [values]).one()
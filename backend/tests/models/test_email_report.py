@@ -8,7 +8,7 @@ from sqlalchemy.exc import IntegrityError
 from app.models import EmailReport, Session
 
 
-def test_email_report_creation(db_session, sample_email_report):
+def test_email_report_creation(sample_email_report):
     """Test creating an email report with required fields."""
     assert sample_email_report.id is not None
     assert sample_email_report.session_id is not None
@@ -32,7 +32,7 @@ def test_email_report_status_constraint(db_session, sample_session):
     assert email_report.status == "sent"
 
 
-def test_email_report_session_relationship(db_session, sample_email_report, sample_session):
+def test_email_report_session_relationship(sample_email_report, sample_session):
     """Test email_report-session relationship."""
     assert sample_email_report.session is not None
     assert sample_email_report.session.id == sample_session.id
@@ -75,7 +75,7 @@ def test_email_report_mark_failed(db_session, sample_session):
     assert email_report.error_message == error_msg
 
 
-def test_email_report_repr(db_session, sample_email_report):
+def test_email_report_repr(sample_email_report):
     """Test email_report __repr__ method."""
     repr_str = repr(sample_email_report)
     assert "EmailReport" in repr_str
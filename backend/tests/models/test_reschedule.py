@@ -7,9 +7,10 @@ from decimal import Decimal
 from sqlalchemy.exc import IntegrityError
 
 from app.models import Reschedule, Session
+from tests.helpers import make_reschedule
 
 
-def test_reschedule_creation(db_session, sample_reschedule):
+def test_reschedule_creation(sample_reschedule):
     """Test creating a reschedule with required fields."""
     assert sample_reschedule.id is not None
     assert sample_reschedule.session_id is not None
@@ -22,14 +23,7 @@ def test_reschedule_creation(db_session, sample_reschedule):
 def test_reschedule_initiator_constraint(db_session, sample_session):
     """Test that initiator must be 'tutor' or 'student'."""
     # Valid initiator
-    reschedule = Reschedule(
-        session_id=sample_session.id,
-        initiator="tutor",
-        original_time=sample_session.scheduled_time,
-        cancelled_at=sample_session.scheduled_time - timedelta(hours=12),
-        created_at=sample_session.scheduled_time - timedelta(hours=12)
-    )
-    db_session.add(reschedule)
+    reschedule = make_reschedule(db_session, sample_session, initiator="tutor")
     db_session.commit()
     
     assert reschedule.initiator == "tutor"
@@ -56,37 +50,20 @@ def test_reschedule_new_time_constraint(db_session, sample_session):
 
 def test_reschedule_unique_session_id(db_session, sample_session):
     """Test that session_id must be unique."""
-    reschedule1 = Reschedule(
-        session_id=sample_session.id,
-        initiator="tutor",
-        original_time=sample_session.scheduled_time,
-        cancelled_at=sample_session.scheduled_time - timedelta(hours=12),
-        created_at=sample_session.scheduled_time - timedelta(hours=12)
-    )
-    db_session.add(reschedule1)
-    db_session.commit()
+    make_reschedule(db_session, sample_session)
     
     # Try to create another reschedule for same session
-    reschedule2 = Reschedule(
-        session_id=sample_session.id,
-        initiator="student",
-        original_time=sample_session.scheduled_time,
-        cancelled_at=sample_session.scheduled_time - timedelta(hours=6),
-        created_at=sample_session.scheduled_time - timedelta(hours=6)
-    )
-    db_session.add(reschedule2)
-    
     with pytest.raises(IntegrityError):
-        db_session.commit()
+        make_reschedule(db_session, sample_session, hours_before=6, initiator="student")
 
 
-def test_reschedule_session_relationship(db_session, sample_reschedule, sample_session):
+def test_reschedule_session_relationship(sample_reschedule, sample_session):
     """Test reschedule-session relationship."""
     assert sample_reschedule.session is not None
     assert sample_reschedule.session.id == sample_session.id
 
 
-def test_reschedule_calculate_hours_before(db_session, sample_reschedule):
+def test_reschedule_calculate_hours_before(sample_reschedule):
     """Test calculate_hours_before method."""
     hours = sample_reschedule.calculate_hours_before()
     assert hours is not None
@@ -96,15 +73,7 @@ def test_reschedule_calculate_hours_before(db_session, sample_reschedule):
 def test_reschedule_is_last_minute(db_session, sample_session):
     """Test is_last_minute method."""
     # Last-minute reschedule (<24 hours)
-    reschedule1 = Reschedule(
-        session_id=sample_session.id,
-        initiator="tutor",
-        original_time=sample_session.scheduled_time,
-        cancelled_at=sample_session.scheduled_time - timedelta(hours=12),
-        created_at=sample_session.scheduled_time - timedelta(hours=12),
-        hours_before_session=Decimal("12.00")
-    )
-    db_session.add(reschedule1)
+    reschedule1 = make_reschedule(db_session, sample_session)
     db_session.commit()
     
     assert reschedule1.is_last_minute() is True
@@ -119,21 +88,13 @@ def test_reschedule_is_last_minute(db_session, sample_session):
     db_session.add(session2)
     db_session.commit()
     
-    reschedule2 = Reschedule(
-        session_id=session2.id,
-        initiator="tutor",
-        original_time=session2.scheduled_time,
-        cancelled_at=session2.scheduled_time - timedelta(hours=48),
-        created_at=session2.scheduled_time - timedelta(hours=48),
-        hours_before_session=Decimal("48.00")
-    )
-    db_session.add(reschedule2)
+    reschedule2 = make_reschedule(db_session, session2, hours_before=48)
     db_session.commit()
     
     assert reschedule2.is_last_minute() is False
 
 
-def test_reschedule_repr(db_session, sample_reschedule):
+def test_reschedule_repr(sample_reschedule):
     """Test reschedule __repr__ method."""
     repr_str = repr(sample_reschedule)
     assert "Reschedule" in repr_str
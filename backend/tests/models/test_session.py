@@ -4,11 +4,13 @@ Tests for Session model.
 import pytest
 from datetime import datetime, timedelta
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload, raiseload
 
-from app.models import Session, Tutor, Reschedule, EmailReport
+from app.models import Session, Tutor, EmailReport
+from tests.helpers import count_queries, make_reschedule
 
 
-def test_session_creation(db_session, sample_session):
+def test_session_creation(sample_session):
     """Test creating a session with required fields."""
     assert sample_session.id is not None
     assert sample_session.tutor_id is not None
@@ -70,25 +72,28 @@ def test_session_time_order_constraint(db_session, sample_tutor):
     assert session.completed_time >= session.scheduled_time
 
 
-def test_session_tutor_relationship(db_session, sample_session, sample_tutor):
-    """Test session-tutor relationship."""
-    assert sample_session.tutor is not None
-    assert sample_session.tutor.id == sample_tutor.id
-    assert sample_session.tutor_id == sample_tutor.id
-
-
-def test_session_reschedule_relationship(db_session, sample_session, sample_reschedule):
-    """Test session-reschedule relationship."""
-    db_session.refresh(sample_session)
-    assert sample_session.reschedule is not None
-    assert sample_session.reschedule.id == sample_reschedule.id
-
-
-def test_session_email_report_relationship(db_session, sample_session, sample_email_report):
-    """Test session-email_report relationship."""
-    db_session.refresh(sample_session)
-    assert sample_session.email_report is not None
-    assert sample_session.email_report.id == sample_email_report.id
+def test_session_relationships(
+    db_session, sample_session, sample_tutor, sample_reschedule, sample_email_report
+):
+    """Test session tutor, reschedule and email_report relationships."""
+    with count_queries(db_session.connection()) as queries:
+        session = db_session.query(Session).options(
+            joinedload(Session.tutor),
+            joinedload(Session.reschedule),
+            joinedload(Session.email_report),
+            raiseload("*")
+        ).populate_existing().filter_by(id=sample_session.id).one()
+        
+        assert session.tutor is not None
+        assert session.tutor.id == sample_tutor.id
+        assert session.tutor_id == sample_tutor.id
+        
+        assert session.reschedule is not None
+        assert session.reschedule.id == sample_reschedule.id
+        
+        assert session.email_report is not None
+        assert session.email_report.id == sample_email_report.id
+    assert len(queries) == 1
 
 
 def test_session_is_rescheduled(db_session, sample_tutor):
@@ -108,18 +113,13 @@ def test_session_is_rescheduled(db_session, sample_tutor):
     assert session.is_rescheduled() is False
     
     # Add reschedule record
-    from app.models import Reschedule
-    reschedule = Reschedule(
-        session_id=session.id,
-        initiator="tutor",
-        original_time=session.scheduled_time,
-        cancelled_at=session.scheduled_time - timedelta(hours=12),
-        created_at=session.scheduled_time - timedelta(hours=12)
-    )
-    db_session.add(reschedule)
+    make_reschedule(db_session, session)
     db_session.commit()
     
-    db_session.refresh(session)
+    # reschedule was loaded as None above; reload it with the session
+    session = db_session.query(Session).options(
+        joinedload(Session.reschedule)
+    ).populate_existing().filter_by(id=session.id).one()
     assert session.is_rescheduled() is True
 
 
@@ -132,17 +132,16 @@ def test_session_is_completed(db_session, sample_session):
     sample_session.completed_time = None
     db_session.commit()
     
-    db_session.refresh(sample_session)
     assert sample_session.is_completed() is False
 
 
-def test_session_get_duration(db_session, sample_session):
+def test_session_get_duration(sample_session):
     """Test get_duration method."""
     duration = sample_session.get_duration()
     assert duration == 60
 
 
-def test_session_repr(db_session, sample_session):
+def test_session_repr(sample_session):
     """Test session __repr__ method."""
     repr_str = repr(sample_session)
     assert "Session" in repr_str
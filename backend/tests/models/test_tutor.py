@@ -5,11 +5,13 @@ import pytest
 from datetime import datetime, timedelta
 from decimal import Decimal
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload, raiseload, selectinload
 
 from app.models import Tutor, Session, TutorScore
+from tests.helpers import count_queries, make_reschedule, unique_suffix
 
 
-def test_tutor_creation(db_session, sample_tutor):
+def test_tutor_creation(sample_tutor):
     """Test creating a tutor with required fields."""
     assert sample_tutor.id is not None
     assert sample_tutor.name.startswith("John Doe")
@@ -35,40 +37,45 @@ def test_tutor_creation_optional_email(db_session):
 
 def test_tutor_unique_email(db_session):
     """Test that email must be unique."""
-    import uuid
-    unique_email = f"test_{uuid.uuid4()}@example.com"
+    unique_email = f"test_{unique_suffix()}@example.com"
     tutor1 = Tutor(name="Tutor 1", email=unique_email)
     db_session.add(tutor1)
-    db_session.commit()
+    db_session.flush()
     
     tutor2 = Tutor(name="Tutor 2", email=unique_email)
     db_session.add(tutor2)
     
     with pytest.raises(IntegrityError):
-        db_session.commit()
+        db_session.flush()
 
 
 def test_tutor_sessions_relationship(db_session, sample_tutor):
     """Test tutor-sessions relationship."""
+    now = datetime.utcnow()
     session1 = Session(
         tutor_id=sample_tutor.id,
         student_id="student_1",
-        scheduled_time=datetime.utcnow(),
+        scheduled_time=now,
         status="completed"
     )
     session2 = Session(
         tutor_id=sample_tutor.id,
         student_id="student_2",
-        scheduled_time=datetime.utcnow(),
+        scheduled_time=now,
         status="completed"
     )
     db_session.add_all([session1, session2])
     db_session.commit()
     
-    db_session.refresh(sample_tutor)
-    assert len(sample_tutor.sessions) == 2
-    assert session1 in sample_tutor.sessions
-    assert session2 in sample_tutor.sessions
+    with count_queries(db_session.connection()) as queries:
+        tutor = db_session.query(Tutor).options(
+            selectinload(Tutor.sessions),
+            raiseload("*")
+        ).populate_existing().filter_by(id=sample_tutor.id).one()
+        assert len(tutor.sessions) == 2
+    assert len(queries) <= 2
+    assert session1 in tutor.sessions
+    assert session2 in tutor.sessions
 
 
 def test_tutor_tutor_score_relationship(db_session, sample_tutor):
@@ -85,9 +92,12 @@ def test_tutor_tutor_score_relationship(db_session, sample_tutor):
     db_session.add(tutor_score)
     db_session.commit()
     
-    db_session.refresh(sample_tutor)
-    assert sample_tutor.tutor_score is not None
-    assert sample_tutor.tutor_score.tutor_id == sample_tutor.id
+    tutor = db_session.query(Tutor).options(
+        joinedload(Tutor.tutor_score),
+        raiseload("*")
+    ).populate_existing().filter_by(id=sample_tutor.id).one()
+    assert tutor.tutor_score is not None
+    assert tutor.tutor_score.tutor_id == sample_tutor.id
 
 
 def test_tutor_get_reschedule_rate(db_session, sample_tutor):
@@ -96,9 +106,8 @@ def test_tutor_get_reschedule_rate(db_session, sample_tutor):
     now = datetime.utcnow()
     cutoff = now - timedelta(days=7)
     
-    import uuid
-    student_id1 = f"student_{uuid.uuid4()}"
-    student_id2 = f"student_{uuid.uuid4()}"
+    student_id1 = f"student_{unique_suffix()}"
+    student_id2 = f"student_{unique_suffix()}"
     
     # Completed session
     session1 = Session(
@@ -121,73 +130,54 @@ def test_tutor_get_reschedule_rate(db_session, sample_tutor):
     db_session.add(session2)
     db_session.commit()
     
-    from app.models import Reschedule
-    reschedule = Reschedule(
-        session_id=session2.id,
-        initiator="tutor",
-        original_time=session2.scheduled_time,
-        cancelled_at=session2.scheduled_time - timedelta(hours=12),
-        created_at=session2.scheduled_time - timedelta(hours=12)
-    )
-    db_session.add(reschedule)
+    make_reschedule(db_session, session2)
     db_session.commit()
     
-    # Refresh tutor to load relationships
-    db_session.refresh(sample_tutor)
+    # Reload tutor with sessions and their reschedules in two queries
+    tutor = db_session.query(Tutor).options(
+        selectinload(Tutor.sessions).joinedload(Session.reschedule),
+        raiseload("*")
+    ).populate_existing().filter_by(id=sample_tutor.id).one()
     
-    rate = sample_tutor.get_reschedule_rate(7)
+    rate = tutor.get_reschedule_rate(7)
     assert rate is not None
     assert rate == 50.0  # 1 reschedule out of 2 sessions
 
 
-def test_tutor_calculate_risk_score(db_session, sample_tutor):
-    """Test calculate_risk_score method."""
+def _add_tutor_score(db_session, tutor_id, rates):
+    """Add a TutorScore with the given (7d, 30d, 90d) reschedule rates."""
+    rate_7d, rate_30d, rate_90d = (Decimal(str(rate)) for rate in rates)
     tutor_score = TutorScore(
-        tutor_id=sample_tutor.id,
-        reschedule_rate_7d=Decimal("5.00"),
-        reschedule_rate_30d=Decimal("8.00"),
-        reschedule_rate_90d=Decimal("10.00"),
+        tutor_id=tutor_id,
+        reschedule_rate_7d=rate_7d,
+        reschedule_rate_30d=rate_30d,
+        reschedule_rate_90d=rate_90d,
         total_sessions_7d=20,
         total_sessions_30d=80,
         total_sessions_90d=200,
         tutor_reschedules_7d=1,
         tutor_reschedules_30d=6,
         tutor_reschedules_90d=20,
-        is_high_risk=False,
+        is_high_risk=max(rates) >= 15,
         risk_threshold=Decimal("15.00"),
         last_calculated_at=datetime.utcnow()
     )
     db_session.add(tutor_score)
-    db_session.commit()
-    
-    db_session.refresh(sample_tutor)
-    risk = sample_tutor.calculate_risk_score()
-    assert risk == "medium"  # Max rate is 10%, which is medium (>= 10% and < 20%)
+    return tutor_score
 
 
-def test_tutor_calculate_risk_score_high(db_session, sample_tutor):
-    """Test calculate_risk_score with high risk."""
-    tutor_score = TutorScore(
-        tutor_id=sample_tutor.id,
-        reschedule_rate_7d=25.0,
-        reschedule_rate_30d=22.0,
-        reschedule_rate_90d=20.0,
-        total_sessions_7d=20,
-        total_sessions_30d=80,
-        total_sessions_90d=200,
-        tutor_reschedules_7d=5,
-        tutor_reschedules_30d=18,
-        tutor_reschedules_90d=40,
-        is_high_risk=True,
-        risk_threshold=15.0,
-        last_calculated_at=datetime.utcnow()
-    )
-    db_session.add(tutor_score)
+@pytest.mark.parametrize("rates,expected", [
+    ((5, 8, 10), "medium"),  # Max rate is 10%, which is medium (>= 10% and < 20%)
+    ((25, 22, 20), "high"),
+    ((1, 1, 1), "low"),
+])
+def test_tutor_calculate_risk_score(db_session, sample_tutor, rates, expected):
+    """Test calculate_risk_score across risk levels."""
+    _add_tutor_score(db_session, sample_tutor.id, rates)
     db_session.commit()
     
-    db_session.refresh(sample_tutor)
     risk = sample_tutor.calculate_risk_score()
-    assert risk == "high"
+    assert risk == expected
 
 
 def test_tutor_cascade_delete(db_session, sample_tutor):
@@ -208,11 +198,11 @@ def test_tutor_cascade_delete(db_session, sample_tutor):
     db_session.commit()
     
     # Session should be deleted
-    deleted_session = db_session.query(Session).filter_by(id=session_id).first()
+    deleted_session = db_session.get(Session, session_id)
     assert deleted_session is None
 
 
-def test_tutor_repr(db_session, sample_tutor):
+def test_tutor_repr(sample_tutor):
     """Test tutor __repr__ method."""
     repr_str = repr(sample_tutor)
     assert "Tutor" in repr_str
@@ -9,7 +9,7 @@ from sqlalchemy.exc import IntegrityError
 from app.models import TutorScore, Tutor
 
 
-def test_tutor_score_creation(db_session, sample_tutor_score):
+def test_tutor_score_creation(sample_tutor_score):
     """Test creating a tutor score with required fields."""
     assert sample_tutor_score.id is not None
     assert sample_tutor_score.tutor_id is not None
@@ -39,6 +39,7 @@ def test_tutor_score_rate_constraint(db_session, sample_tutor):
 
 def test_tutor_score_unique_tutor_id(db_session, sample_tutor):
     """Test that tutor_id must be unique."""
+    now = datetime.utcnow()
     tutor_score1 = TutorScore(
         tutor_id=sample_tutor.id,
         reschedule_rate_7d=Decimal("5.00"),
@@ -46,10 +47,10 @@ def test_tutor_score_unique_tutor_id(db_session, sample_tutor):
         tutor_reschedules_7d=1,
         is_high_risk=False,
         risk_threshold=Decimal("15.00"),
-        last_calculated_at=datetime.utcnow()
+        last_calculated_at=now
     )
     db_session.add(tutor_score1)
-    db_session.commit()
+    db_session.flush()
     
     # Try to create another score for same tutor
     tutor_score2 = TutorScore(
@@ -59,21 +60,21 @@ def test_tutor_score_unique_tutor_id(db_session, sample_tutor):
         tutor_reschedules_7d=3,
         is_high_risk=False,
         risk_threshold=Decimal("15.00"),
-        last_calculated_at=datetime.utcnow()
+        last_calculated_at=now
     )
     db_session.add(tutor_score2)
     
     with pytest.raises(IntegrityError):
-        db_session.commit()
+        db_session.flush()
 
 
-def test_tutor_score_tutor_relationship(db_session, sample_tutor_score, sample_tutor):
+def test_tutor_score_tutor_relationship(sample_tutor_score, sample_tutor):
     """Test tutor_score-tutor relationship."""
     assert sample_tutor_score.tutor is not None
     assert sample_tutor_score.tutor.id == sample_tutor.id
 
 
-def test_tutor_score_update_rates(db_session, sample_tutor_score):
+def test_tutor_score_update_rates(sample_tutor_score):
     """Test update_rates method."""
     sample_tutor_score.update_rates(
         rates_7d=Decimal("10.00"),
@@ -92,7 +93,7 @@ def test_tutor_score_update_rates(db_session, sample_tutor_score):
     assert sample_tutor_score.tutor_reschedules_7d == 3
 
 
-def test_tutor_score_check_risk_flag(db_session, sample_tutor):
+def test_tutor_score_check_risk_flag(sample_tutor):
     """Test check_risk_flag method."""
     # Low risk
     tutor_score = TutorScore(
@@ -119,7 +120,7 @@ def test_tutor_score_check_risk_flag(db_session, sample_tutor):
     assert tutor_score.is_high_risk is True
 
 
-def test_tutor_score_to_dict(db_session, sample_tutor_score):
+def test_tutor_score_to_dict(sample_tutor_score):
     """Test to_dict method."""
     result = sample_tutor_score.to_dict()
     
@@ -132,7 +133,7 @@ def test_tutor_score_to_dict(db_session, sample_tutor_score):
     assert result['is_high_risk'] is False
 
 
-def test_tutor_score_repr(db_session, sample_tutor_score):
+def test_tutor_score_repr(sample_tutor_score):
     """Test tutor_score __repr__ method."""
     repr_str = repr(sample_tutor_score)
     assert "TutorScore" in repr_str
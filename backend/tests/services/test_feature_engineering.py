@@ -2,12 +2,20 @@
 Tests for feature engineering service.
 """
 import pytest
+import numpy as np
 from decimal import Decimal
 
 from app.services.feature_engineering import (
+    FEATURE_ORDER,
+    MISMATCH_KEYS,
     calculate_mismatch_scores,
     calculate_compatibility_score,
-    extract_features
+    calculate_mismatch_scores_bulk,
+    calculate_compatibility_score_bulk,
+    calculate_compatibility_score_columns,
+    extract_features,
+    extract_features_bulk,
+    extract_features_vec
 )
 from app.models.student import Student
 from app.models.tutor import Tutor
@@ -94,6 +102,18 @@ class TestMismatchScores:
         assert "style_mismatch" in scores
         assert "communication_mismatch" in scores
         assert "age_difference" in scores
+    
+    @pytest.mark.parametrize("student_style,tutor_style,expected", [
+        ("Socratic", "socratic", 0.0),     # Same unknown style
+        ("socratic", "montessori", 1.0),   # Different unknown styles
+        ("socratic", "structured", 1.0),   # Unknown vs known style
+    ])
+    def test_calculate_mismatch_scores_unknown_styles(self, student_style, tutor_style, expected):
+        """Test that styles outside the known set still compare by name."""
+        student = Student(id=None, name="Test Student", preferred_teaching_style=student_style)
+        tutor = Tutor(id=None, name="Test Tutor", teaching_style=tutor_style)
+        
+        assert calculate_mismatch_scores(student, tutor)["style_mismatch"] == expected
 
 
 class TestCompatibilityScore:
@@ -136,6 +156,50 @@ class TestCompatibilityScore:
         assert compatibility >= 0.0
 
 
+class TestBulkScores:
+    """Test vectorized mismatch and compatibility scores."""
+    
+    def test_bulk_matches_scalar(self, sample_student, sample_tutor):
+        """Test bulk scores equal per-pair scores, including missing data."""
+        tutors = [
+            sample_tutor,
+            Tutor(id=None, name="Opposite Tutor", age=45, preferred_pace=1,
+                  teaching_style="Flexible", communication_style=5),
+            Tutor(id=None, name="Sparse Tutor"),  # Missing preferences
+        ]
+        
+        mismatch_matrix = calculate_mismatch_scores_bulk(sample_student, tutors)
+        compatibility = calculate_compatibility_score_bulk(mismatch_matrix)
+        
+        assert mismatch_matrix.shape == (3, len(MISMATCH_KEYS))
+        for row, tutor, bulk_compatibility in zip(mismatch_matrix, tutors, compatibility):
+            scores = calculate_mismatch_scores(sample_student, tutor)
+            assert list(row) == pytest.approx([scores[key] for key in MISMATCH_KEYS])
+            assert bulk_compatibility == pytest.approx(calculate_compatibility_score(scores))
+    
+    def test_columns_match_bulk(self, sample_student, sample_tutor):
+        """Test column-wise scores equal the bulk path, including missing data."""
+        tutors = [
+            sample_tutor,
+            Tutor(id=None, name="Opposite Tutor", age=45, preferred_pace=1,
+                  teaching_style="flexible", communication_style=5),
+            Tutor(id=None, name="Sparse Tutor"),  # Missing preferences
+        ]
+        expected = calculate_compatibility_score_bulk(
+            calculate_mismatch_scores_bulk(sample_student, tutors)
+        )
+        
+        # Styles as IDs (structured=0, flexible=1); -1 marks a missing value
+        compatibility = calculate_compatibility_score_columns(
+            student_pace=[3, 3, 3], tutor_pace=[3, 1, -1],
+            student_style_id=[0, 0, 0], tutor_style_id=[0, 1, -1],
+            student_communication=[3, 3, 3], tutor_communication=[3, 5, -1],
+            student_age=[15, 15, 15], tutor_age=[30, 45, -1],
+        )
+        
+        assert compatibility == pytest.approx(expected)
+
+
 class TestExtractFeatures:
     """Test feature extraction."""
     
@@ -166,3 +230,36 @@ class TestExtractFeatures:
         assert features["tutor_total_sessions_30d"] == 50
         assert features["tutor_is_high_risk"] == 0.0
 
+    
+    def test_extract_features_vec_matches_dict(self, sample_student, sample_tutor):
+        """Test the float32 vector holds the dict's values in FEATURE_ORDER."""
+        tutor_stats = {"reschedule_rate_30d": 10.5, "total_sessions_30d": 50, "is_high_risk": True}
+        
+        features = extract_features(sample_student, sample_tutor, tutor_stats)
+        vec = extract_features_vec(sample_student, sample_tutor, tutor_stats)
+        
+        assert list(features) == list(FEATURE_ORDER)
+        assert vec.dtype == np.float32
+        assert vec.tolist() == pytest.approx(list(features.values()), rel=1e-6)
+    
+    def test_extract_features_bulk_matches_vec(self, sample_student, sample_tutor):
+        """Test the bulk matrix equals per-tutor vectors, reusing bulk scores."""
+        tutors = [
+            sample_tutor,
+            Tutor(id=None, name="Sparse Tutor"),  # Missing preferences
+        ]
+        tutor_stats_list = [
+            {"reschedule_rate_30d": 10.5, "total_sessions_30d": 50, "is_high_risk": True},
+            None,
+        ]
+        mismatch_matrix = calculate_mismatch_scores_bulk(sample_student, tutors)
+        
+        matrix = extract_features_bulk(
+            sample_student, tutors, tutor_stats_list,
+            mismatch_matrix, calculate_compatibility_score_bulk(mismatch_matrix)
+        )
+        
+        assert matrix.shape == (2, len(FEATURE_ORDER))
+        for row, tutor, tutor_stats in zip(matrix, tutors, tutor_stats_list):
+            vec = extract_features_vec(sample_student, tutor, tutor_stats)
+            assert row.tolist() == pytest.approx(vec.tolist(), rel=1e-6)
@@ -3,9 +3,13 @@ Tests for match prediction service.
 """
 import pytest
 from decimal import Decimal
+from unittest.mock import patch
 
+from app.services import match_prediction_service
 from app.services.match_prediction_service import (
+    clear_prediction_cache,
     determine_risk_level,
+    determine_risk_level_bulk,
     predict_churn_risk,
     predict_match,
     get_or_create_match_prediction
@@ -17,22 +21,33 @@ from app.models.tutor import Tutor
 class TestRiskLevel:
     """Test risk level determination."""
     
-    def test_determine_risk_level_low(self):
-        """Test low risk level."""
-        assert determine_risk_level(0.2) == "low"
-        assert determine_risk_level(0.29) == "low"
+    @pytest.mark.parametrize("probability,expected", [
+        (0.2, "low"),
+        (0.29, "low"),
+        (0.3, "medium"),
+        (0.5, "medium"),
+        (0.69, "medium"),
+        (0.7, "high"),
+        (0.9, "high"),
+        (1.0, "high"),
+    ])
+    def test_determine_risk_level(self, probability, expected):
+        """Test risk level boundaries."""
+        assert determine_risk_level(probability) == expected
     
-    def test_determine_risk_level_medium(self):
-        """Test medium risk level."""
-        assert determine_risk_level(0.3) == "medium"
-        assert determine_risk_level(0.5) == "medium"
-        assert determine_risk_level(0.69) == "medium"
+    def test_determine_risk_level_bulk_matches_scalar(self):
+        """Test that the bulk lookup agrees with the scalar one."""
+        probabilities = [0.0, 0.29, 0.3, 0.69, 0.7, 1.0]
+        assert determine_risk_level_bulk(probabilities) == [
+            determine_risk_level(p) for p in probabilities
+        ]
     
-    def test_determine_risk_level_high(self):
-        """Test high risk level."""
-        assert determine_risk_level(0.7) == "high"
-        assert determine_risk_level(0.9) == "high"
-        assert determine_risk_level(1.0) == "high"
+    def test_environment_overrides_thresholds(self, monkeypatch):
+        """Test that threshold env vars are read per call and beat explicit args."""
+        monkeypatch.setenv("MATCH_RISK_THRESHOLD_LOW", "0.1")
+        monkeypatch.setenv("MATCH_RISK_THRESHOLD_HIGH", "0.2")
+        assert determine_risk_level(0.15, low_threshold=0.5, high_threshold=0.9) == "medium"
+        assert determine_risk_level_bulk([0.05, 0.15, 0.25], 0.5, 0.9) == ["low", "medium", "high"]
 
 
 class TestPredictMatch:
@@ -72,6 +87,23 @@ class TestPredictMatch:
         assert 0.0 <= prediction["churn_probability"] <= 1.0
         assert 0.0 <= prediction["compatibility_score"] <= 1.0
     
+    def test_predict_match_memoized_by_features(self):
+        """Test that repeat predictions reuse the result until an input changes."""
+        clear_prediction_cache()
+        student = Student(name="Memo Student", age=15, preferred_pace=3, urgency_level=3)
+        tutor = Tutor(name="Memo Tutor", age=30, preferred_pace=3)
+        
+        with patch.object(
+            match_prediction_service, "predict_churn_risk", wraps=predict_churn_risk
+        ) as churn_risk:
+            first = predict_match(student, tutor)
+            assert predict_match(student, tutor) == first
+            assert churn_risk.call_count == 1
+            
+            student.preferred_pace = 5
+            predict_match(student, tutor)
+            assert churn_risk.call_count == 2
+    
     def test_get_or_create_match_prediction(self, db_session):
         """Test getting or creating match prediction."""
         student = Student(
@@ -3,9 +3,13 @@ Tests for reschedule rate calculator service.
 """
 import pytest
 from datetime import datetime, timedelta
-from decimal import Decimal
+from uuid import uuid4
 
-from app.services.reschedule_calculator import calculate_reschedule_rate, get_session_counts
+from app.services.reschedule_calculator import (
+    calculate_reschedule_rate,
+    get_session_counts,
+    get_session_counts_bulk,
+)
 from app.models.tutor import Tutor
 from app.models.session import Session as SessionModel
 from app.models.reschedule import Reschedule
@@ -19,18 +23,20 @@ def test_calculate_reschedule_rate_no_sessions(db_session, sample_tutor):
 
 def test_calculate_reschedule_rate_no_reschedules(db_session, sample_tutor):
     """Test calculation with sessions but no reschedules."""
-    # Create completed sessions
-    for i in range(10):
-        session = SessionModel(
-            tutor_id=sample_tutor.id,
-            student_id=f"student_{i}",
-            scheduled_time=datetime.utcnow() - timedelta(days=i),
-            completed_time=datetime.utcnow() - timedelta(days=i) + timedelta(hours=1),
-            status="completed",
-            duration_minutes=60
-        )
-        db_session.add(session)
-    db_session.commit()
+    now = datetime.utcnow()
+    # Create completed sessions with one executemany INSERT
+    db_session.execute(SessionModel.__table__.insert(), [
+        {
+            "tutor_id": sample_tutor.id,
+            "student_id": f"student_{i}",
+            "scheduled_time": now - timedelta(days=i),
+            "completed_time": now - timedelta(days=i) + timedelta(hours=1),
+            "status": "completed",
+            "duration_minutes": 60
+        }
+        for i in range(10)
+    ])
+    db_session.flush()
     
     rate = calculate_reschedule_rate(str(sample_tutor.id), 30, db_session)
     assert rate == 0.0
@@ -38,33 +44,35 @@ def test_calculate_reschedule_rate_no_reschedules(db_session, sample_tutor):
 
 def test_calculate_reschedule_rate_with_reschedules(db_session, sample_tutor):
     """Test calculation with tutor-initiated reschedules."""
-    # Create 10 sessions
-    sessions = []
-    for i in range(10):
-        session = SessionModel(
-            tutor_id=sample_tutor.id,
-            student_id=f"student_{i}",
-            scheduled_time=datetime.utcnow() - timedelta(days=i),
-            status="rescheduled",
-            duration_minutes=None
-        )
-        db_session.add(session)
-        sessions.append(session)
-    db_session.flush()
+    now = datetime.utcnow()
+    # Create 10 sessions; ids are assigned here so reschedules can reference them
+    sessions = [
+        {
+            "id": uuid4(),
+            "tutor_id": sample_tutor.id,
+            "student_id": f"student_{i}",
+            "scheduled_time": now - timedelta(days=i),
+            "status": "rescheduled",
+            "duration_minutes": None
+        }
+        for i in range(10)
+    ]
+    db_session.execute(SessionModel.__table__.insert(), sessions)
     
     # Create 3 tutor-initiated reschedules
-    for i in range(3):
-        reschedule = Reschedule(
-            session_id=sessions[i].id,
-            initiator="tutor",
-            original_time=sessions[i].scheduled_time,
-            new_time=sessions[i].scheduled_time + timedelta(days=1),
-            reason="Test",
-            cancelled_at=sessions[i].scheduled_time - timedelta(hours=12),
-            hours_before_session=Decimal("12.00")
-        )
-        db_session.add(reschedule)
-    db_session.commit()
+    db_session.execute(Reschedule.__table__.insert(), [
+        {
+            "session_id": session["id"],
+            "initiator": "tutor",
+            "original_time": session["scheduled_time"],
+            "new_time": session["scheduled_time"] + timedelta(days=1),
+            "reason": "Test",
+            "cancelled_at": session["scheduled_time"] - timedelta(hours=12),
+            "hours_before_session": 12.0
+        }
+        for session in sessions[:3]
+    ])
+    db_session.flush()
     
     rate = calculate_reschedule_rate(str(sample_tutor.id), 30, db_session)
     assert rate == 30.0  # 3 reschedules / 10 sessions = 30%
@@ -89,10 +97,10 @@ def test_calculate_reschedule_rate_student_reschedules_not_counted(db_session, s
         new_time=session.scheduled_time + timedelta(days=1),
         reason="Test",
         cancelled_at=session.scheduled_time - timedelta(hours=12),
-        hours_before_session=Decimal("12.00")
+        hours_before_session=12.0
     )
     db_session.add(reschedule)
-    db_session.commit()
+    db_session.flush()
     
     rate = calculate_reschedule_rate(str(sample_tutor.id), 30, db_session)
     assert rate == 0.0  # Student reschedules don't count
@@ -100,20 +108,62 @@ def test_calculate_reschedule_rate_student_reschedules_not_counted(db_session, s
 
 def test_get_session_counts(db_session, sample_tutor):
     """Test getting session counts."""
+    now = datetime.utcnow()
     # Create sessions
-    for i in range(5):
-        session = SessionModel(
-            tutor_id=sample_tutor.id,
-            student_id=f"student_{i}",
-            scheduled_time=datetime.utcnow() - timedelta(days=i),
-            status="completed" if i < 3 else "rescheduled",
-            completed_time=datetime.utcnow() - timedelta(days=i) + timedelta(hours=1) if i < 3 else None,
-            duration_minutes=60 if i < 3 else None
-        )
-        db_session.add(session)
-    db_session.commit()
+    db_session.execute(SessionModel.__table__.insert(), [
+        {
+            "tutor_id": sample_tutor.id,
+            "student_id": f"student_{i}",
+            "scheduled_time": now - timedelta(days=i),
+            "status": "completed" if i < 3 else "rescheduled",
+            "completed_time": now - timedelta(days=i) + timedelta(hours=1) if i < 3 else None,
+            "duration_minutes": 60 if i < 3 else None
+        }
+        for i in range(5)
+    ])
+    db_session.flush()
     
     total, reschedules = get_session_counts(str(sample_tutor.id), 30, db_session)
     assert total == 5
     assert reschedules == 0  # No tutor-initiated reschedules yet
 
+
+
+def test_get_session_counts_bulk(db_session, sample_tutor):
+    """Test bulk session counts across tutors."""
+    other_tutor = Tutor(name="Other Tutor", is_active=True)
+    idle_tutor = Tutor(name="Idle Tutor", is_active=True)
+    db_session.add_all([other_tutor, idle_tutor])
+    db_session.flush()
+    
+    now = datetime.utcnow()
+    sessions = [
+        SessionModel(
+            tutor_id=tutor_id,
+            student_id=f"student_{i}",
+            scheduled_time=now - timedelta(days=i),
+            status="rescheduled"
+        )
+        for tutor_id, n in ((sample_tutor.id, 4), (other_tutor.id, 2))
+        for i in range(n)
+    ]
+    db_session.add_all(sessions)
+    db_session.flush()
+    
+    # One tutor-initiated and one student-initiated reschedule for sample_tutor
+    for session, initiator in zip(sessions[:2], ("tutor", "student")):
+        db_session.add(Reschedule(
+            session_id=session.id,
+            initiator=initiator,
+            original_time=session.scheduled_time,
+            cancelled_at=session.scheduled_time - timedelta(hours=12)
+        ))
+    db_session.flush()
+    
+    tutor_ids = [str(sample_tutor.id), str(other_tutor.id), str(idle_tutor.id)]
+    counts = get_session_counts_bulk(tutor_ids, 30, db_session)
+    
+    assert counts[str(sample_tutor.id)] == (4, 1)
+    assert counts[str(other_tutor.id)] == (2, 0)
+    assert str(idle_tutor.id) not in counts
+    assert get_session_counts(str(sample_tutor.id), 30, db_session) == (4, 1)
@@ -4,6 +4,7 @@ Tests for score update service.
 import pytest
 from datetime import datetime, timedelta
 from decimal import Decimal
+from uuid import uuid4
 
 from app.services.score_service import update_scores_for_tutor, check_risk_flag
 from app.models.tutor import Tutor
@@ -33,7 +34,7 @@ def test_update_scores_for_tutor_updates_existing(db_session, sample_tutor):
         last_calculated_at=datetime.utcnow() - timedelta(hours=2)
     )
     db_session.add(initial_score)
-    db_session.commit()
+    db_session.flush()
     
     # Update scores
     updated_score = update_scores_for_tutor(str(sample_tutor.id), db_session)
@@ -44,34 +45,37 @@ def test_update_scores_for_tutor_updates_existing(db_session, sample_tutor):
 
 def test_update_scores_for_tutor_high_risk_flag(db_session, sample_tutor):
     """Test that high risk flag is set when rate exceeds threshold."""
-    # Create sessions with high reschedule rate
-    sessions = []
-    for i in range(10):
-        session = SessionModel(
-            tutor_id=sample_tutor.id,
-            student_id=f"student_{i}",
-            scheduled_time=datetime.utcnow() - timedelta(days=i),
-            status="rescheduled" if i < 2 else "completed",
-            completed_time=None if i < 2 else datetime.utcnow() - timedelta(days=i) + timedelta(hours=1),
-            duration_minutes=None if i < 2 else 60
-        )
-        db_session.add(session)
-        sessions.append(session)
-    db_session.flush()
+    now = datetime.utcnow()
+    # Create sessions with high reschedule rate; ids are assigned here so
+    # reschedules can reference them
+    sessions = [
+        {
+            "id": uuid4(),
+            "tutor_id": sample_tutor.id,
+            "student_id": f"student_{i}",
+            "scheduled_time": now - timedelta(days=i),
+            "status": "rescheduled" if i < 2 else "completed",
+            "completed_time": None if i < 2 else now - timedelta(days=i) + timedelta(hours=1),
+            "duration_minutes": None if i < 2 else 60
+        }
+        for i in range(10)
+    ]
+    db_session.execute(SessionModel.__table__.insert(), sessions)
     
     # Create 2 tutor-initiated reschedules (20% rate)
-    for i in range(2):
-        reschedule = Reschedule(
-            session_id=sessions[i].id,
-            initiator="tutor",
-            original_time=sessions[i].scheduled_time,
-            new_time=sessions[i].scheduled_time + timedelta(days=1),
-            reason="Test",
-            cancelled_at=sessions[i].scheduled_time - timedelta(hours=12),
-            hours_before_session=Decimal("12.00")
-        )
-        db_session.add(reschedule)
-    db_session.commit()
+    db_session.execute(Reschedule.__table__.insert(), [
+        {
+            "session_id": session["id"],
+            "initiator": "tutor",
+            "original_time": session["scheduled_time"],
+            "new_time": session["scheduled_time"] + timedelta(days=1),
+            "reason": "Test",
+            "cancelled_at": session["scheduled_time"] - timedelta(hours=12),
+            "hours_before_session": 12.0
+        }
+        for session in sessions[:2]
+    ])
+    db_session.flush()
     
     # Update scores (threshold is 15%, rate is 20%)
     score = update_scores_for_tutor(str(sample_tutor.id), db_session, risk_threshold=15.0)
@@ -81,20 +85,20 @@ def test_update_scores_for_tutor_high_risk_flag(db_session, sample_tutor):
 
 def test_update_scores_for_tutor_low_risk_flag(db_session, sample_tutor):
     """Test that high risk flag is not set when rate is below threshold."""
+    now = datetime.utcnow()
     # Create sessions with low reschedule rate
-    sessions = []
-    for i in range(10):
-        session = SessionModel(
-            tutor_id=sample_tutor.id,
-            student_id=f"student_{i}",
-            scheduled_time=datetime.utcnow() - timedelta(days=i),
-            status="completed",
-            completed_time=datetime.utcnow() - timedelta(days=i) + timedelta(hours=1),
-            duration_minutes=60
-        )
-        db_session.add(session)
-        sessions.append(session)
-    db_session.commit()
+    db_session.execute(SessionModel.__table__.insert(), [
+        {
+            "tutor_id": sample_tutor.id,
+            "student_id": f"student_{i}",
+            "scheduled_time": now - timedelta(days=i),
+            "status": "completed",
+            "completed_time": now - timedelta(days=i) + timedelta(hours=1),
+            "duration_minutes": 60
+        }
+        for i in range(10)
+    ])
+    db_session.flush()
     
     # Update scores (no reschedules, rate is 0%)
     score = update_scores_for_tutor(str(sample_tutor.id), db_session, risk_threshold=15.0)
@@ -104,7 +108,6 @@ def test_update_scores_for_tutor_low_risk_flag(db_session, sample_tutor):
 
 def test_update_scores_for_tutor_invalid_tutor_id(db_session):
     """Test that ValueError is raised for invalid tutor_id."""
-    from uuid import uuid4
     fake_id = uuid4()
     
     with pytest.raises(ValueError, match="Tutor with id.*not found"):
@@ -124,12 +127,12 @@ def test_check_risk_flag(db_session, sample_tutor):
         last_calculated_at=datetime.utcnow()
     )
     db_session.add(score)
-    db_session.commit()
+    db_session.flush()
     
     # Check risk flag
     is_high_risk = check_risk_flag(str(sample_tutor.id), 15.0, db_session)
     
     assert is_high_risk is True
-    db_session.refresh(score)
-    assert score.is_high_risk is True
+    stored = db_session.query(TutorScore).populate_existing().filter_by(id=score.id).one()
+    assert stored.is_high_risk is True
 
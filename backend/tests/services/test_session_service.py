@@ -11,6 +11,7 @@ from app.schemas.reschedule import RescheduleInfo
 from app.models.session import Session as SessionModel
 from app.models.tutor import Tutor
 from app.models.reschedule import Reschedule
+from tests.helpers import count_queries
 
 
 def test_create_session_success(db_session, sample_tutor):
@@ -81,6 +82,37 @@ def test_create_session_creates_tutor_if_not_exists(db_session):
     # Verify tutor was created
     tutor = db_session.query(Tutor).filter(Tutor.id == tutor_id).first()
     assert tutor is not None
+    
+    # The tutor is now known, so the next session skips the tutor upsert
+    next_session = session_data.model_copy(update={"session_id": uuid4()})
+    with count_queries(db_session.connection()) as queries:
+        create_session(next_session, db_session)
+    inserts = [q for q in queries if q.lstrip().upper().startswith("INSERT")]
+    assert inserts and not [q for q in inserts if "tutors" in q]
+
+
+def test_create_session_recreates_deleted_known_tutor(db_session):
+    """Test that a tutor deleted after being cached is recreated, not an error."""
+    tutor_id = uuid4()
+    session_data = SessionCreate(
+        session_id=uuid4(),
+        tutor_id=tutor_id,
+        student_id="student_123",
+        scheduled_time=datetime.utcnow(),
+        status="completed"
+    )
+    create_session(session_data, db_session)
+    
+    # Delete the tutor behind the service's back
+    db_session.query(SessionModel).filter(SessionModel.tutor_id == tutor_id).delete()
+    db_session.query(Tutor).filter(Tutor.id == tutor_id).delete()
+    db_session.commit()
+    
+    next_session = session_data.model_copy(update={"session_id": uuid4()})
+    session = create_session(next_session, db_session)
+    
+    assert session.tutor_id == tutor_id
+    assert db_session.get(Tutor, tutor_id) is not None
 
 
 def test_create_session_duplicate_id(db_session, sample_tutor):
@@ -4,12 +4,15 @@ Tests for tutor service.
 import pytest
 from datetime import datetime, timedelta
 from decimal import Decimal
+from uuid import uuid4
 
 from app.services.tutor_service import get_tutors, get_tutor_by_id, get_tutor_statistics, get_tutor_history
+from app.utils.cache import invalidate_tutor_score
 from app.models.tutor import Tutor
 from app.models.tutor_score import TutorScore
 from app.models.session import Session as SessionModel
 from app.models.reschedule import Reschedule
+from tests.helpers import count_queries
 
 
 def test_get_tutors_all(db_session, sample_tutor, sample_tutor_score):
@@ -38,11 +41,17 @@ def test_get_tutors_high_risk_filter(db_session, sample_tutor):
         last_calculated_at=datetime.utcnow()
     )
     db_session.add(high_risk_score)
-    db_session.commit()
+    db_session.flush()
     
+    # Drop the identity map's loaded scores so get_tutors has to populate them
+    db_session.expire_all()
     tutors, total = get_tutors(db_session, risk_status="high_risk")
     assert total >= 1
-    assert all(t.tutor_score.is_high_risk is True for t in tutors if t.tutor_score)
+    
+    # tutor_score comes from the filter's join; iterating must not lazy-load
+    with count_queries(db_session.connection()) as queries:
+        assert all(t.tutor_score.is_high_risk is True for t in tutors if t.tutor_score)
+    assert len(queries) == 0
 
 
 def test_get_tutors_sorting(db_session, sample_tutor, sample_tutor_score):
@@ -73,7 +82,6 @@ def test_get_tutor_by_id_success(db_session, sample_tutor, sample_tutor_score):
 
 def test_get_tutor_by_id_not_found(db_session):
     """Test getting non-existent tutor."""
-    from uuid import uuid4
     fake_id = uuid4()
     
     tutor = get_tutor_by_id(str(fake_id), db_session)
@@ -89,6 +97,23 @@ def test_get_tutor_statistics(db_session, sample_tutor, sample_tutor_score):
     assert "is_high_risk" in stats
 
 
+def test_get_tutor_statistics_fresh_after_invalidation(db_session, sample_tutor, sample_tutor_score):
+    """Test that statistics reflect a score change once its cache entry is dropped."""
+    tutor_id = str(sample_tutor.id)
+    first = get_tutor_statistics(tutor_id, db_session)
+    
+    # Callers get their own dict
+    first["reschedule_rate_30d"] = -1
+    assert get_tutor_statistics(tutor_id, db_session)["reschedule_rate_30d"] == 8.5
+    
+    # Score updates invalidate the Redis entry (see score_service)
+    sample_tutor_score.reschedule_rate_30d = Decimal("12.00")
+    db_session.flush()
+    invalidate_tutor_score(tutor_id)
+    
+    assert get_tutor_statistics(tutor_id, db_session)["reschedule_rate_30d"] == 12.0
+
+
 def test_get_tutor_history(db_session, sample_tutor, sample_session):
     """Test getting tutor history."""
     # Create reschedule
@@ -99,10 +124,10 @@ def test_get_tutor_history(db_session, sample_tutor, sample_session):
         new_time=sample_session.scheduled_time + timedelta(days=1),
         reason="Test",
         cancelled_at=sample_session.scheduled_time - timedelta(hours=12),
-        hours_before_session=Decimal("12.00")
+        hours_before_session=12.0
     )
     db_session.add(reschedule)
-    db_session.commit()
+    db_session.flush()
     
     reschedules, trend = get_tutor_history(str(sample_tutor.id), days=90, limit=100, db=db_session)
     
@@ -0,0 +1,56 @@
+"""
+Tests for nightly score refresh task.
+"""
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from app.tasks.nightly_score_refresh import refresh_all_tutor_scores
+from app.models.tutor import Tutor
+from app.models.session import Session as SessionModel
+from app.models.reschedule import Reschedule
+from app.models.tutor_score import TutorScore
+
+
+def test_refresh_all_tutor_scores(db_session, sample_tutor):
+    """Test that every active tutor gets a score from the bulk counts."""
+    idle_tutor = Tutor(name="Idle Tutor", is_active=True)
+    inactive_tutor = Tutor(name="Inactive Tutor", is_active=False)
+    db_session.add_all([idle_tutor, inactive_tutor])
+    db_session.flush()
+    
+    # 4 sessions for sample_tutor, one with a tutor-initiated reschedule (25%)
+    now = datetime.utcnow()
+    sessions = [
+        {
+            "id": uuid4(),
+            "tutor_id": sample_tutor.id,
+            "student_id": f"student_{i}",
+            "scheduled_time": now - timedelta(days=i),
+            "status": "rescheduled"
+        }
+        for i in range(4)
+    ]
+    db_session.execute(SessionModel.__table__.insert(), sessions)
+    db_session.execute(Reschedule.__table__.insert(), [{
+        "session_id": sessions[0]["id"],
+        "initiator": "tutor",
+        "original_time": sessions[0]["scheduled_time"],
+        "cancelled_at": sessions[0]["scheduled_time"] - timedelta(hours=12),
+        "hours_before_session": 12.0
+    }])
+    db_session.commit()
+    
+    result = refresh_all_tutor_scores()
+    assert result["status"] == "success"
+    
+    scores = {
+        score.tutor_id: score
+        for score in db_session.query(TutorScore).populate_existing().filter(
+            TutorScore.tutor_id.in_([sample_tutor.id, idle_tutor.id, inactive_tutor.id])
+        )
+    }
+    assert scores[sample_tutor.id].total_sessions_30d == 4
+    assert scores[sample_tutor.id].tutor_reschedules_30d == 1
+    assert scores[sample_tutor.id].is_high_risk is True
+    assert scores[idle_tutor.id].total_sessions_30d == 0
+    assert inactive_tutor.id not in scores
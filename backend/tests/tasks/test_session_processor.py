@@ -2,13 +2,11 @@
 Tests for session processor task.
 """
 import pytest
-from unittest.mock import patch, MagicMock
-from datetime import datetime, timedelta
+from unittest.mock import patch
 from uuid import uuid4
 
-from app.tasks.session_processor import process_session
+from app.tasks.session_processor import process_session, bulk_enqueue_sessions
 from app.models.tutor import Tutor
-from app.models.session import Session as SessionModel
 from app.models.tutor_score import TutorScore
 
 
@@ -20,36 +18,20 @@ def mock_celery_task():
     return decorator
 
 
-def test_process_session_success(db_session, sample_tutor):
+def test_process_session_success(db_session, sample_tutor, sample_session):
     """Test successful session processing."""
-    # Create session
-    session = SessionModel(
-        tutor_id=sample_tutor.id,
-        student_id="student_123",
-        scheduled_time=datetime.utcnow(),
-        completed_time=datetime.utcnow() + timedelta(hours=1),
-        status="completed",
-        duration_minutes=60
-    )
-    db_session.add(session)
-    db_session.commit()
+    # Process the module's completed session (inserted once per module)
+    result = process_session(str(sample_session.id))
     
-    # Mock email task
-    with patch('app.tasks.session_processor.send_email_report.delay') as mock_email:
-        mock_email.return_value = None
-        
-        # Process session
-        result = process_session(str(session.id))
-        
-        assert result["status"] == "success"
-        assert result["session_id"] == str(session.id)
-        
-        # Verify scores were updated
-        score = db_session.query(TutorScore).filter(TutorScore.tutor_id == sample_tutor.id).first()
-        assert score is not None
+    assert result["status"] == "success"
+    assert result["session_id"] == str(sample_session.id)
+    
+    # Verify scores were updated
+    score = db_session.query(TutorScore).filter(TutorScore.tutor_id == sample_tutor.id).first()
+    assert score is not None
 
 
-def test_process_session_not_found(db_session):
+def test_process_session_not_found():
     """Test processing non-existent session."""
     fake_id = uuid4()
     
@@ -57,30 +39,41 @@ def test_process_session_not_found(db_session):
         process_session(str(fake_id))
 
 
-def test_process_session_retry_on_error(db_session, sample_tutor):
+@pytest.mark.parametrize("retries,expected_error", [
+    (0, "Retry"),            # Transient error is retried
+    (3, "Database error"),   # Retries exhausted: original error propagates
+])
+def test_process_session_retry_on_error(sample_session, retries, expected_error):
     """Test that task retries on transient errors."""
-    # Create session
-    session = SessionModel(
-        tutor_id=sample_tutor.id,
-        student_id="student_123",
-        scheduled_time=datetime.utcnow(),
-        status="completed"
-    )
-    db_session.add(session)
-    db_session.commit()
-    
-    # Mock update_scores to raise error
-    with patch('app.tasks.session_processor.update_scores_for_tutor') as mock_update:
+    # Mock update_scores to raise error, and retry() to raise instead of
+    # scheduling a new attempt
+    with patch('app.tasks.session_processor.update_scores_for_tutor') as mock_update, \
+         patch.object(process_session, 'retry', side_effect=Exception("Retry")):
         mock_update.side_effect = Exception("Database error")
         
-        # Should raise retry exception
-        task_instance = MagicMock()
-        task_instance.request.retries = 0
-        task_instance.max_retries = 3
-        task_instance.retry = MagicMock(side_effect=Exception("Retry"))
-        
-        # This would normally be handled by Celery
-        # For testing, we just verify the error is raised
-        with pytest.raises(Exception):
-            process_session.__wrapped__(task_instance, str(session.id))
+        # run() executes the task body against the pushed request context,
+        # as a worker would on its Nth attempt
+        process_session.push_request(retries=retries)
+        try:
+            with pytest.raises(Exception, match=expected_error):
+                process_session.run(str(sample_session.id))
+        finally:
+            process_session.pop_request()
+
 
+def test_bulk_enqueue_sessions_reuses_producer():
+    """Test that bulk enqueue publishes every session through one producer."""
+    session_ids = [str(uuid4()) for _ in range(3)]
+    
+    with patch('app.tasks.session_processor.celery_app.producer_or_acquire') as mock_acquire, \
+         patch('app.tasks.session_processor.enqueue_session') as mock_enqueue:
+        producer = mock_acquire.return_value.__enter__.return_value
+        
+        results = bulk_enqueue_sessions(session_ids)
+        
+        assert len(results) == 3
+        mock_acquire.assert_called_once()
+        assert mock_enqueue.call_count == 3
+        for call, session_id in zip(mock_enqueue.call_args_list, session_ids):
+            assert call.args == (session_id,)
+            assert call.kwargs == {"producer": producer}
@@ -6,23 +6,39 @@ from pathlib import Path
 import numpy as np
 import joblib
 import json
+from collections import Counter
 
 # Add backend to path
 backend_dir = Path(__file__).parent.parent / 'backend'
 sys.path.insert(0, str(backend_dir))
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from app.utils.database import SessionLocal
 from app.models.session import Session as SessionModel
 from app.models.session_reschedule_prediction import SessionReschedulePrediction
+from app.models.tutor import Tutor
 from app.services.reschedule_feature_engineering import extract_features
-from app.services.tutor_service import get_tutor_statistics
+
+
+def _top_k(names, scores, k):
+    """Return (name, score) for the k highest scores, highest first."""
+    scores = np.asarray(scores)
+    k = min(k, len(scores))
+    if k == 0:
+        return []
+    # argpartition finds the top k in O(F); only those k are then sorted
+    top = np.argpartition(-scores, k - 1)[:k]
+    top = top[np.argsort(-scores[top])]
+    return [(names[i], scores[i]) for i in top]
+
 
 def analyze_predictions():
     """Analyze current predictions and feature distributions."""
-    print("=" * 60)
-    print("Reschedule Model Diagnostic")
-    print("=" * 60)
+    # The report is written in one go once the analysis finishes
+    lines = []
+    lines.append("=" * 60)
+    lines.append("Reschedule Model Diagnostic")
+    lines.append("=" * 60)
     
     # Load model
     model_path = backend_dir / 'models' / 'reschedule_model.pkl'
@@ -32,73 +48,91 @@ def analyze_predictions():
     with open(feature_names_path) as f:
         feature_names = json.load(f)
     
-    print(f"\nModel Info:")
-    print(f"  Classes: {model.n_classes_}")
-    print(f"  Features: {len(feature_names)}")
+    lines.append(f"\nModel Info:")
+    lines.append(f"  Classes: {model.n_classes_}")
+    lines.append(f"  Features: {len(feature_names)}")
     
     # Get sample predictions from database
     db = SessionLocal()
     try:
-        predictions = db.query(SessionReschedulePrediction).limit(50).all()
+        # Sessions, tutors and tutor scores arrive with the predictions in a
+        # single joined query instead of one lookup per sample
+        predictions = db.query(SessionReschedulePrediction).options(
+            joinedload(SessionReschedulePrediction.session, innerjoin=True)
+            .joinedload(SessionModel.tutor, innerjoin=True)
+            .joinedload(Tutor.tutor_score)
+        ).limit(50).all()
         
         if not predictions:
-            print("\n❌ No predictions found in database")
+            lines.append("\n❌ No predictions found in database")
             return
         
         probabilities = [float(p.reschedule_probability) for p in predictions]
         
-        print(f"\n📊 Prediction Statistics (sample of {len(predictions)}):")
-        print(f"  Min: {min(probabilities):.4f} ({min(probabilities)*100:.2f}%)")
-        print(f"  Max: {max(probabilities):.4f} ({max(probabilities)*100:.2f}%)")
-        print(f"  Mean: {np.mean(probabilities):.4f} ({np.mean(probabilities)*100:.2f}%)")
-        print(f"  Median: {np.median(probabilities):.4f} ({np.median(probabilities)*100:.2f}%)")
-        print(f"  Std Dev: {np.std(probabilities):.4f}")
+        lines.append(f"\n📊 Prediction Statistics (sample of {len(predictions)}):")
+        lines.append(f"  Min: {min(probabilities):.4f} ({min(probabilities)*100:.2f}%)")
+        lines.append(f"  Max: {max(probabilities):.4f} ({max(probabilities)*100:.2f}%)")
+        lines.append(f"  Mean: {np.mean(probabilities):.4f} ({np.mean(probabilities)*100:.2f}%)")
+        lines.append(f"  Median: {np.median(probabilities):.4f} ({np.median(probabilities)*100:.2f}%)")
+        lines.append(f"  Std Dev: {np.std(probabilities):.4f}")
+        
+        # One batched predict_proba over an (N, F) matrix instead of N single rows;
+        # float32 is what the trees compare against, and absent features stay 0
+        feature_index = {name: i for i, name in enumerate(feature_names)}
+        feature_matrix = np.zeros((len(predictions), len(feature_names)), dtype=np.float32)
+        for row, pred in enumerate(predictions):
+            session = pred.session
+            # Same dict get_tutor_statistics returns, from the joined score row
+            tutor_score = session.tutor.tutor_score
+            tutor_stats = tutor_score.to_dict() if tutor_score else {}
+            features = extract_features(session, tutor_stats, db)
+            known = [(feature_index[name], value) for name, value in features.items() if name in feature_index]
+            if known:
+                columns, values = zip(*known)
+                feature_matrix[row, list(columns)] = values
+            if row == 0:
+                sample_pred, sample_session = pred, session
+                sample_stats, sample_features = tutor_stats, features
+        model_probs = model.predict_proba(feature_matrix)[:, 1]
+        stored_probs = np.array(probabilities)
         
         # Analyze feature distributions for a sample prediction
-        sample_pred = predictions[0]
-        session = db.query(SessionModel).filter(
-            SessionModel.id == sample_pred.session_id
-        ).first()
+        lines.append(f"\n🔍 Sample Feature Values:")
+        lines.append(f"  Session: {sample_session.id}")
+        lines.append(f"  Tutor reschedule rate (30d): {sample_stats.get('reschedule_rate_30d', 0):.2f}%")
+        lines.append(f"  Session duration: {sample_session.duration_minutes} minutes")
         
-        if session:
-            tutor_stats = get_tutor_statistics(str(session.tutor_id), db)
-            features = extract_features(session, tutor_stats, db)
-            
-            print(f"\n🔍 Sample Feature Values:")
-            print(f"  Session: {session.id}")
-            print(f"  Tutor reschedule rate (30d): {tutor_stats.get('reschedule_rate_30d', 0):.2f}%")
-            print(f"  Session duration: {session.duration_minutes} minutes")
-            
-            # Show top features by value
-            sorted_features = sorted(features.items(), key=lambda x: abs(x[1]), reverse=True)
-            print(f"\n  Top 10 Features by Absolute Value:")
-            for name, value in sorted_features[:10]:
-                print(f"    {name}: {value:.4f}")
-            
-            # Check if features match model expectations
-            feature_vector = np.array([[features.get(name, 0.0) for name in feature_names]])
-            predicted_prob = model.predict_proba(feature_vector)[0, 1]
-            
-            print(f"\n  Model Prediction: {predicted_prob:.4f} ({predicted_prob*100:.2f}%)")
-            print(f"  Stored Prediction: {float(sample_pred.reschedule_probability):.4f} ({float(sample_pred.reschedule_probability)*100:.2f}%)")
-            
-            # Check feature importance
-            print(f"\n📈 Model Feature Importance (Top 5):")
-            importance_dict = dict(zip(feature_names, model.feature_importances_))
-            top_important = sorted(importance_dict.items(), key=lambda x: x[1], reverse=True)[:5]
-            for name, importance in top_important:
-                print(f"  {name}: {importance:.4f} ({importance*100:.2f}%)")
+        # Show top features by value
+        names = list(sample_features)
+        values = np.fromiter(sample_features.values(), dtype=np.float64, count=len(names))
+        lines.append(f"\n  Top 10 Features by Absolute Value:")
+        for name, _ in _top_k(names, np.abs(values), 10):
+            lines.append(f"    {name}: {sample_features[name]:.4f}")
+        
+        # Check if features match model expectations
+        predicted_prob = model_probs[0]
+        lines.append(f"\n  Model Prediction: {predicted_prob:.4f} ({predicted_prob*100:.2f}%)")
+        lines.append(f"  Stored Prediction: {float(sample_pred.reschedule_probability):.4f} ({float(sample_pred.reschedule_probability)*100:.2f}%)")
+        
+        drift = np.abs(model_probs - stored_probs)
+        lines.append(f"\n  Model vs Stored ({len(predictions)} sessions):")
+        lines.append(f"    Mean abs difference: {drift.mean():.4f}")
+        lines.append(f"    Max abs difference: {drift.max():.4f}")
+        
+        # Check feature importance
+        lines.append(f"\n📈 Model Feature Importance (Top 5):")
+        for name, importance in _top_k(feature_names, model.feature_importances_, 5):
+            lines.append(f"  {name}: {importance:.4f} ({importance*100:.2f}%)")
         
         # Check risk level distribution
-        risk_levels = {}
-        for p in predictions:
-            risk_levels[p.risk_level] = risk_levels.get(p.risk_level, 0) + 1
+        risk_levels = Counter(p.risk_level for p in predictions)
         
-        print(f"\n⚠️  Risk Level Distribution:")
+        lines.append(f"\n⚠️  Risk Level Distribution:")
         for level, count in sorted(risk_levels.items()):
-            print(f"  {level}: {count} ({count/len(predictions)*100:.1f}%)")
+            lines.append(f"  {level}: {count} ({count/len(predictions)*100:.1f}%)")
         
     finally:
+        sys.stdout.write("\n".join(lines) + "\n")
         db.close()
 
 if __name__ == "__main__":
@@ -493,7 +493,7 @@ def generate_reschedules(db: SessionLocal, sessions: List[Session]) -> List[Resc
             reason=reason,
             reason_code=reason_code,
             cancelled_at=cancelled_at,
-            hours_before_session=Decimal(str(round(hours_before, 2))),
+            hours_before_session=round(hours_before, 2),
             created_at=cancelled_at
         )
         